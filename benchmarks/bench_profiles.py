@@ -0,0 +1,120 @@
+# benchmarks/bench_profiles.py
+"""
+Replay a recording through the capture → recognizer path for each audio
+profile and report time-to-final and CPU cost.
+
+The WAV is cut into blocks of the profile's block_size at MIC_RATE, each
+block "arrives" when it would have on a live mic, and goes through the same
+conversion, batching and endpointing as halo.core.listener. Time-to-final is
+measured from the end of the last word in a result (Vosk word timings) to
+the moment the final is produced on that simulated clock.
+
+Usage (from the repo root, needs numpy + vosk + the configured model):
+    python benchmarks/bench_profiles.py meeting.wav
+    python benchmarks/bench_profiles.py meeting.wav --profiles low-latency balanced
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from halo.core import listener  # noqa: E402
+
+
+def load_as_mic(path: str) -> np.ndarray:
+    """Read a 16-bit WAV and return float32 frames shaped like the mic stream."""
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError("Expected a 16-bit PCM WAV")
+        rate, channels = wav.getframerate(), wav.getnchannels()
+        audio = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+    audio = audio.reshape(-1, channels).astype(np.float32) / 32768.0
+
+    if rate != listener.MIC_RATE:
+        n = int(len(audio) * listener.MIC_RATE / rate)
+        x = np.linspace(0, len(audio) - 1, n)
+        audio = np.stack(
+            [np.interp(x, np.arange(len(audio)), audio[:, c]) for c in range(channels)], axis=1
+        ).astype(np.float32)
+    if channels < listener.CHANNELS:
+        audio = np.repeat(audio[:, :1], listener.CHANNELS, axis=1)
+    return np.ascontiguousarray(audio[:, :listener.CHANNELS])
+
+
+def replay(audio: np.ndarray, profile: str) -> dict:
+    import vosk
+
+    listener.set_profile(profile)
+    rec = vosk.KaldiRecognizer(listener.load_model(), listener.TARGET_RATE)
+    rec.SetWords(True)
+    listener._configure_recognizer(rec)
+
+    block, feed_bytes = listener.BLOCK_SIZE, listener.FEED_BYTES
+    clock = 0.0
+    pending, pending_len, calls = [], 0, 0
+    ttf = []
+    cpu_start = time.process_time()
+
+    for start in range(0, len(audio) - block + 1, block):
+        clock = max(clock, (start + block) / listener.MIC_RATE)  # block arrives
+        t0 = time.perf_counter()
+
+        pcm = listener.resample_and_downmix(
+            audio[start:start + block].tobytes(), listener.MIC_RATE, listener.TARGET_RATE
+        )
+        pending.append(pcm)
+        pending_len += len(pcm)
+        final = None
+        if pending_len >= feed_bytes:
+            calls += 1
+            if rec.AcceptWaveform(b"".join(pending)):
+                final = json.loads(rec.Result())
+            else:
+                rec.PartialResult()
+            pending, pending_len = [], 0
+
+        clock += time.perf_counter() - t0
+        words = (final or {}).get("result") or []
+        if words:
+            ttf.append(clock - words[-1]["end"])
+
+    cpu = time.process_time() - cpu_start
+    duration = len(audio) / listener.MIC_RATE
+    return {
+        "profile": profile,
+        "block_ms": 1000 * block / listener.MIC_RATE,
+        "calls": calls,
+        "finals": len(ttf),
+        "ttf_median": statistics.median(ttf) if ttf else float("nan"),
+        "ttf_p90": sorted(ttf)[int(0.9 * (len(ttf) - 1))] if ttf else float("nan"),
+        "cpu_pct": 100 * cpu / duration,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay audio through each audio profile")
+    parser.add_argument("wav", help="16-bit PCM WAV recording to replay")
+    parser.add_argument("--profiles", nargs="*", default=None,
+                        help="profiles to compare (default: all in settings.yaml)")
+    args = parser.parse_args()
+
+    audio = load_as_mic(args.wav)
+    print(f"Replaying {len(audio) / listener.MIC_RATE:.1f} s of audio\n")
+    print(f"{'profile':<14}{'block ms':>10}{'calls':>8}{'finals':>8}"
+          f"{'ttf med s':>11}{'ttf p90 s':>11}{'CPU %':>8}")
+    for name in args.profiles or listener.list_profiles():
+        r = replay(audio, name)
+        print(f"{r['profile']:<14}{r['block_ms']:>10.0f}{r['calls']:>8}{r['finals']:>8}"
+              f"{r['ttf_median']:>11.2f}{r['ttf_p90']:>11.2f}{r['cpu_pct']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
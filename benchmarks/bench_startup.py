@@ -0,0 +1,115 @@
+# benchmarks/bench_startup.py
+"""
+Startup regression check.
+
+Each module is imported in a fresh interpreter (run from the repo root) and
+its wall-clock import time is compared with a budget. It also checks that
+nothing heavy happens at import: no Vosk model is loaded and the ollama
+client is not imported until it is needed. A module is skipped only when
+an optional package (OPTIONAL_PACKAGES) is not installed; any other import
+error fails the check.
+
+Usage:
+    python benchmarks/bench_startup.py            # exits 1 on regression
+    python benchmarks/bench_startup.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Import-time budgets in milliseconds (best of N runs, fresh interpreter).
+BUDGETS_MS = {
+    "halo.utils.config_loader": 150,
+    "halo.core.llm": 200,
+    "halo.core.listener": 600,
+    "halo.core.pipeline": 650,
+    "halo.ui.overlay": 1500,
+}
+
+# Modules that must not be imported as a side effect of importing the app.
+DEFERRED_MODULES = ["vosk", "ollama"]
+
+# Third-party packages whose absence skips a module instead of failing it
+# (audio, UI and STT stacks that a CI box may not have).
+OPTIONAL_PACKAGES = {"sounddevice", "PyQt6", "vosk"}
+
+_PROBE = r"""
+import importlib, json, sys, time
+t0 = time.perf_counter()
+importlib.import_module(sys.argv[1])
+elapsed = (time.perf_counter() - t0) * 1000
+listener = sys.modules.get("halo.core.listener")
+print(json.dumps({
+    "ms": elapsed,
+    "loaded": [m for m in sys.argv[2:] if m in sys.modules],
+    "model_loaded": bool(listener and listener.vosk_model is not None),
+}))
+"""
+
+
+class SkipModule(Exception):
+    """An optional third-party package is not installed here."""
+
+
+def probe(module: str) -> dict:
+    """
+    Import `module` in a fresh interpreter. Raises SkipModule if only an
+    optional package is missing, RuntimeError for any other import failure.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE, module, *DEFERRED_MODULES],
+        cwd=REPO_ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        missing = re.findall(r"ModuleNotFoundError: No module named '([^'.]+)", proc.stderr)
+        if missing and missing[-1] in OPTIONAL_PACKAGES:
+            raise SkipModule(missing[-1])
+        lines = proc.stderr.strip().splitlines()
+        raise RuntimeError(lines[-1] if lines else f"exit code {proc.returncode}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'module':<28}{'best ms':>10}{'budget':>10}  notes")
+    for module, budget in BUDGETS_MS.items():
+        try:
+            results = [probe(module) for _ in range(args.runs)]
+        except SkipModule as e:
+            print(f"{module:<28}{'-':>10}{budget:>10}  skipped ({e} not installed)")
+            continue
+        except RuntimeError as e:
+            failures.append(module)
+            print(f"{module:<28}{'-':>10}{budget:>10}  import failed: {e}")
+            continue
+
+        best = min(r["ms"] for r in results)
+        notes = []
+        if best > budget:
+            notes.append("over budget")
+        if results[0]["loaded"]:
+            notes.append("imports " + ", ".join(results[0]["loaded"]))
+        if results[0]["model_loaded"]:
+            notes.append("loads Vosk model")
+        if notes:
+            failures.append(module)
+        print(f"{module:<28}{best:>10.0f}{budget:>10}  {'; '.join(notes) or 'ok'}")
+
+    if failures:
+        print(f"\nStartup regression in: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+# halo/core/archive.py
+"""
+Raw audio archive: the 16 kHz int16 mono stream fed to the recognizer,
+written to a preallocated, growable memory-mapped file per session.
+
+File layout (<name>.pcm):
+    [64-byte header][int16 samples ...][unused preallocated space]
+
+Header (little endian):
+    magic b"HALOPCM1" | sample_rate u32 | channels u16 | sample_width u16 |
+    samples_written u64 | created (unix seconds) u64 | zero padding
+
+Segments (final transcripts) are indexed in <name>.idx.jsonl as
+    {"start": <sample>, "end": <sample>, "text": "..."}
+so any range can be read back as a zero-copy view for replay or
+re-transcription.
+"""
+
+import json
+import mmap
+import os
+import struct
+import time
+
+import numpy as np
+
+from halo.utils import profiling
+
+MAGIC = b"HALOPCM1"
+HEADER_FORMAT = "<8sIHHQQ"
+HEADER_SIZE = 64
+SAMPLE_WIDTH = 2            # int16
+SAMPLES_OFFSET = struct.calcsize("<8sIHH")  # where samples_written lives
+
+
+class AudioArchive:
+    """
+    Append-only PCM archive for one session.
+
+    Writing happens on the recognizer thread (never in the audio callback),
+    so capture latency is unaffected. When the preallocated space runs out
+    the file is doubled and remapped; views handed out earlier stay valid
+    because the old mapping is only closed once nobody references it.
+    """
+
+    def __init__(self, path, sample_rate=16000, initial_seconds=600, readonly=False):
+        self.path = path
+        self.index_path = os.path.splitext(path)[0] + ".idx.jsonl"
+        self.readonly = readonly
+        self._retired = []   # old mappings that still have exported views
+
+        if readonly:
+            self._file = open(path, "rb")
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, self.sample_rate, channels, width, self.samples_written, self.created = \
+                struct.unpack_from(HEADER_FORMAT, self._mm, 0)
+            if magic != MAGIC or channels != 1 or width != SAMPLE_WIDTH:
+                raise ValueError(f"Not a Halo PCM archive: {path}")
+            return
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.sample_rate = sample_rate
+        self.samples_written = 0
+        self.created = int(time.time())
+        self._capacity = HEADER_SIZE + int(initial_seconds * sample_rate) * SAMPLE_WIDTH
+
+        self._file = open(path, "w+b")
+        self._file.truncate(self._capacity)  # preallocate
+        self._mm = mmap.mmap(self._file.fileno(), self._capacity)
+        struct.pack_into(HEADER_FORMAT, self._mm, 0, MAGIC, sample_rate, 1,
+                         SAMPLE_WIDTH, 0, self.created)
+        self._index = open(self.index_path, "a", encoding="utf-8")
+
+    @classmethod
+    def open(cls, path):
+        """Open a finished (or in-progress) archive read-only."""
+        return cls(path, readonly=True)
+
+    # ------------------ Writing ------------------
+
+    def write(self, pcm: bytes) -> int:
+        """Append int16 mono PCM; returns the sample offset it was written at."""
+        start = self.samples_written
+        pos = HEADER_SIZE + start * SAMPLE_WIDTH
+        end = pos + len(pcm)
+        if end > self._capacity:
+            self._grow(end)
+        self._mm[pos:end] = pcm
+        self.samples_written += len(pcm) // SAMPLE_WIDTH
+        profiling.count("bytes_written", len(pcm))
+        struct.pack_into("<Q", self._mm, SAMPLES_OFFSET, self.samples_written)
+        return start
+
+    def mark_segment(self, start: int, end: int, text: str):
+        """Record which samples a final transcript segment came from."""
+        self._index.write(json.dumps({"start": start, "end": end, "text": text},
+                                     ensure_ascii=False) + "\n")
+        self._index.flush()
+
+    def _grow(self, needed):
+        capacity = self._capacity
+        while capacity < needed:
+            capacity = HEADER_SIZE + (capacity - HEADER_SIZE) * 2
+        self._mm.flush()
+        if os.name != "nt":
+            # Windows extends the file itself when mapping past its end, and
+            # refuses to resize a file that is still mapped
+            self._file.truncate(capacity)
+        old, self._mm = self._mm, mmap.mmap(self._file.fileno(), capacity)
+        self._capacity = capacity
+        self._retire(old)
+
+    def _retire(self, mm):
+        """Close a mapping now, or later if views into it are still alive."""
+        self._retired.append(mm)
+        still_used = []
+        for m in self._retired:
+            try:
+                m.close()
+            except BufferError:
+                still_used.append(m)
+        self._retired = still_used
+
+    # ------------------ Reading ------------------
+
+    def view(self, start_sample: int, end_sample: int) -> memoryview:
+        """Zero-copy view of raw PCM bytes for [start_sample, end_sample)."""
+        end_sample = min(end_sample, self.samples_written)
+        start_sample = max(0, min(start_sample, end_sample))
+        begin = HEADER_SIZE + start_sample * SAMPLE_WIDTH
+        return memoryview(self._mm)[begin:HEADER_SIZE + end_sample * SAMPLE_WIDTH]
+
+    def samples(self, start_sec: float, end_sec: float) -> np.ndarray:
+        """int16 samples between two times (seconds), as a view on the file."""
+        view = self.view(int(start_sec * self.sample_rate), int(end_sec * self.sample_rate))
+        return np.frombuffer(view, dtype=np.int16)
+
+    def segments(self) -> list:
+        """All indexed segments, oldest first."""
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def duration(self) -> float:
+        return self.samples_written / self.sample_rate
+
+    # ------------------ Lifecycle ------------------
+
+    def close(self):
+        """Flush, release mappings and trim the unused preallocated tail."""
+        if self.readonly:
+            self._retire(self._mm)
+            self._file.close()
+            return
+
+        self._mm.flush()
+        self._index.close()
+        self._retire(self._mm)
+        if not self._retired:
+            # Only shrink once nothing is mapped (Windows refuses otherwise)
+            self._file.truncate(HEADER_SIZE + self.samples_written * SAMPLE_WIDTH)
+        self._file.close()
@@ -0,0 +1,187 @@
+# halo/core/bus.py
+"""
+Small publish/subscribe event bus for the transcript pipeline.
+
+Publishers call `bus.publish(topic, event)`, which never blocks: every
+subscribed stage has its own queue and thread, so a slow consumer cannot
+stall recognition or any other stage. A stage's queue size is a soft
+capacity:
+  - droppable topics (partials by default) that do not fit are dropped
+    for that stage only, and counted;
+  - every other topic (finals, "stopped", "end", ...) is always queued,
+    even past capacity, so transcripts and end-of-stream markers are
+    never lost. Going over capacity is counted and reported once.
+
+    bus = EventBus()
+    bus.subscribe("persist", save_line, topics=["final"])
+    for event in bus.subscription("ui", topics=["partial", "transcript"]):
+        ...
+"""
+
+import queue
+import threading
+import time
+
+DEFAULT_QUEUE_SIZE = 256
+DROPPABLE_TOPICS = ("partial",)   # superseded by the next partial anyway
+
+
+class _Consumer:
+    """Queue + counters shared by handler stages and subscriptions."""
+
+    def __init__(self, name, topics, maxsize, droppable=DROPPABLE_TOPICS):
+        self.name = name
+        self.topics = set(topics)
+        self.queue = queue.Queue()  # capacity is enforced in offer(), per topic
+        self.capacity = maxsize
+        self.droppable = set(droppable)
+        self.received = 0
+        self.processed = 0
+        self.dropped = 0
+        self.over_capacity = 0
+        self.max_depth = 0
+        self.busy_seconds = 0.0
+        self.started_at = time.monotonic()
+
+    def offer(self, topic, event):
+        self.received += 1
+        if self.queue.qsize() >= self.capacity:
+            if topic in self.droppable:
+                self.dropped += 1
+                return
+            self.over_capacity += 1
+            if self.over_capacity == 1:
+                print(f"[Bus] Stage '{self.name}' is over capacity ({self.capacity}); "
+                      f"queueing {topic} events anyway")
+        self.queue.put_nowait((topic, event))
+        depth = self.queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def stats(self) -> dict:
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            "topics": sorted(self.topics),
+            "depth": self.queue.qsize(),
+            "max_depth": self.max_depth,
+            "capacity": self.capacity,
+            "received": self.received,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "over_capacity": self.over_capacity,
+            "per_second": self.processed / elapsed,
+            "busy_pct": 100 * self.busy_seconds / elapsed,
+        }
+
+
+class Stage(_Consumer):
+    """A named consumer running `handler(topic, event)` on its own thread."""
+
+    def __init__(self, name, handler, topics, maxsize=DEFAULT_QUEUE_SIZE):
+        super().__init__(name, topics, maxsize)
+        self.handler = handler
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"stage-{name}", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                topic, event = self.queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            t0 = time.perf_counter()
+            try:
+                self.handler(topic, event)
+            except Exception as e:
+                print(f"[Bus] Stage '{self.name}' failed on {topic}: {e}")
+            self.busy_seconds += time.perf_counter() - t0
+            self.processed += 1
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout=timeout)
+
+
+class Subscription(_Consumer):
+    """
+    A stage consumed by iteration instead of a handler thread (for
+    generator-style consumers such as record_continuous). Iteration stops
+    when a `stop_topic` event arrives or `close()` is called.
+    """
+
+    def __init__(self, bus, name, topics, maxsize=DEFAULT_QUEUE_SIZE, stop_topic="end"):
+        super().__init__(name, set(topics) | {stop_topic}, maxsize)
+        self.bus = bus
+        self.stop_topic = stop_topic
+        self._closed = threading.Event()
+
+    def __iter__(self):
+        try:
+            while not self._closed.is_set():
+                try:
+                    topic, event = self.queue.get(timeout=0.2)
+                except queue.Empty:
+                    continue
+                self.processed += 1
+                if topic == self.stop_topic:
+                    break
+                yield event
+        finally:
+            self.close()
+
+    def close(self):
+        self._closed.set()
+        self.bus.unsubscribe(self)
+
+    def stop(self, timeout=1.0):
+        self.close()
+
+
+class EventBus:
+    """Routes published events to every stage subscribed to the topic."""
+
+    def __init__(self):
+        self._stages = []
+        self._lock = threading.Lock()
+        self.published = {}
+
+    def publish(self, topic: str, event: dict):
+        """Hand `event` to each subscribed stage; never blocks."""
+        self.published[topic] = self.published.get(topic, 0) + 1
+        with self._lock:
+            stages = list(self._stages)
+        for stage in stages:
+            if topic in stage.topics:
+                stage.offer(topic, event)
+
+    def subscribe(self, name, handler, topics, maxsize=DEFAULT_QUEUE_SIZE) -> Stage:
+        """Run `handler(topic, event)` on a dedicated thread for these topics."""
+        stage = Stage(name, handler, topics, maxsize)
+        with self._lock:
+            self._stages.append(stage)
+        return stage
+
+    def subscription(self, name, topics, maxsize=DEFAULT_QUEUE_SIZE, stop_topic="end") -> Subscription:
+        """Iterable subscription; see Subscription."""
+        sub = Subscription(self, name, topics, maxsize, stop_topic)
+        with self._lock:
+            self._stages.append(sub)
+        return sub
+
+    def unsubscribe(self, stage):
+        with self._lock:
+            if stage in self._stages:
+                self._stages.remove(stage)
+        if isinstance(stage, Stage):
+            stage.stop()
+
+    def stats(self) -> dict:
+        """Queue depth and throughput per stage, plus publish counts per topic."""
+        with self._lock:
+            stages = list(self._stages)
+        return {
+            "published": dict(self.published),
+            "stages": {stage.name: stage.stats() for stage in stages},
+        }
@@ -1,42 +1,214 @@
 # halo/core/listener.py
 
+import gc
+import heapq
+import itertools
 import queue
+import threading
+import time
 import sounddevice as sd
 import numpy as np
-import vosk
 import json
+from halo.utils.config_loader import config, config_service
+from halo.utils import profiling
 
 # ===== CONFIG =====
 MIC_RATE = 48000       # native mic rate (your laptop mic)
 TARGET_RATE = 16000    # what Vosk expects
-CHANNELS = 2           # mic is stereo (2 channels)
-BLOCK_SIZE = 8192     # or use  16384  
+CHANNELS = 2           # channels opened when a source does not pick its own
+BLOCK_SIZE = 8192      # frames per callback at MIC_RATE (set by the profile)
 
-# Queue for streaming audio
-audio_queue = queue.Queue()
+# Latency/CPU profile (configs/settings.yaml → profiles). A profile sets the
+# capture block size, how much audio is batched per recognizer call and the
+# Vosk endpointing behaviour. audio.block_size, if set, overrides the profile.
+DEFAULT_PROFILE = "balanced"
+DEFAULT_PROFILE_SETTINGS = {"block_size": 8192, "feed_ms": 0, "endpointer_mode": "default"}
+PROFILE = DEFAULT_PROFILE
+FEED_BYTES = 0               # 0 = feed every block as soon as it arrives
+ENDPOINTER = ("default", None)  # (mode, [t_start_max, t_end, t_max] or None)
 
-# Initialize Vosk model
-MODEL_PATH = r"C:\Users\Hari\AppData\Local\vosk-model-en-in-0.5"
-vosk_model = vosk.Model(MODEL_PATH)
-recognizer = vosk.KaldiRecognizer(vosk_model, TARGET_RATE)
+# With several sources, a final is held until every other source has caught
+# up (posted a later event, or is not mid-utterance), so the merged transcript
+# comes out ordered by when each utterance started, not when it was decoded.
+# This is the longest a final waits on a source that has gone quiet mid-speech.
+REORDER_WINDOW = 0.5   # seconds
+
+# Blocks a source may queue before the capture callback starts dropping
+# audio (~11 s at the balanced block size) instead of growing without bound.
+SOURCE_QUEUE_SIZE = 64
+
+# Vosk model shared by every source (loaded lazily by load_model() so
+# importing this module is cheap)
+MODEL_PATH = config.stt.get("model_path") or r"C:\Users\Hari\AppData\Local\vosk-model-en-in-0.5"
+vosk_model = None
+_loaded_path = None   # path vosk_model was loaded from; MODEL_PATH is the one wanted
+_model_lock = threading.Lock()
+
+# Live reconfiguration: bumping a generation makes each source rebuild or
+# reconfigure its recognizer at its next utterance boundary.
+_model_generation = 0
+_endpointer_generation = 0
+_pending_block_size = None
 
 # Flag for stopping listener
 stop_listening = False
 
+# Pause state: cleared while paused so recognizer threads block with no CPU use
+_resume_event = threading.Event()
+_resume_event.set()
 
-# ------------------ Helpers ------------------
+# Active sources and the InputStreams feeding them (built by start_stream)
+_sources = []
+_captures = []
+_capture_lock = threading.Lock()
 
-def resample_and_downmix(data: bytes, samplerate: int, target_rate: int) -> bytes:
+# Tagged events from every source's recognizer thread
+_results = queue.Queue()
+
+
+# ------------------ Model ------------------
+
+def load_model():
     """
-    Convert stereo float32 → mono int16 PCM at target_rate (for Vosk).
+    Load the shared Vosk model once. Safe to call from a background thread
+    at startup; later calls return immediately.
+    """
+    global vosk_model, _loaded_path
+    with _model_lock:
+        if vosk_model is None:
+            import vosk  # heavy native import, keep it off the startup path
+            path = MODEL_PATH
+            vosk_model = vosk.Model(path)
+            _loaded_path = path
+            if MODEL_PATH != path:
+                # stt.model_path was edited while this load was running
+                threading.Thread(target=_load_replacement, args=(MODEL_PATH,), daemon=True).start()
+    return vosk_model
+
+
+def is_model_loaded() -> bool:
+    return vosk_model is not None
+
+
+def _new_recognizer():
+    import vosk
+    rec = vosk.KaldiRecognizer(load_model(), TARGET_RATE)
+    _configure_recognizer(rec)
+    return rec
+
+
+def _load_replacement(path):
+    """
+    Load a new model off the audio path and publish it. Each source moves to
+    it at its next utterance boundary; Vosk frees the old model once the last
+    recognizer built on it is gone.
+    """
+    global vosk_model, MODEL_PATH, _loaded_path, _model_generation
+    import vosk
+    print(f"[Listener] Loading Vosk model in background: {path}")
+    try:
+        model = vosk.Model(path)
+    except Exception as e:
+        # Passed validation (it is a directory) but is not a usable model:
+        # keep the current one and make config say so again
+        print(f"[Config] Ignoring invalid settings: stt.model_path {path!r} "
+              f"could not be loaded as a Vosk model ({e}); keeping {_loaded_path!r}")
+        MODEL_PATH = _loaded_path
+        config_service.revert("stt", "model_path", _loaded_path)
+        return
+    with _model_lock:
+        MODEL_PATH, vosk_model, _loaded_path = path, model, path
+        _model_generation += 1
+    gc.collect()
+    print(f"[Listener] Switched to Vosk model: {MODEL_PATH}")
+
+
+def _on_stt_config(stt):
+    global MODEL_PATH
+    path = stt.get("model_path") if stt is not None else None
+    if not path or path == MODEL_PATH:
+        return
+    MODEL_PATH = path
+    if vosk_model is None:
+        # Never loaded yet: load_model() picks up the new path, or (if a
+        # load is already running) replaces its result when it finishes
+        return
+    threading.Thread(target=_load_replacement, args=(path,), daemon=True).start()
+
+
+def _configure_recognizer(rec):
+    """Apply the profile's endpointing (needs a Vosk build with endpointer support)."""
+    mode, delays = ENDPOINTER
+    if not hasattr(rec, "SetEndpointerMode"):
+        return
+    import vosk
+    rec.SetEndpointerMode(getattr(vosk.EndpointerMode, mode.upper()))
+    if delays:
+        rec.SetEndpointerDelays(*delays)
+
+
+# ------------------ Profiles ------------------
+
+def get_profile(name: str) -> dict:
+    """Settings for a named profile from settings.yaml, over the defaults."""
+    profiles = config.get("profiles") or {}
+    if name == DEFAULT_PROFILE and name not in profiles:
+        return dict(DEFAULT_PROFILE_SETTINGS)  # older settings.yaml without a profiles section
+    if name not in profiles:
+        raise ValueError(f"Unknown audio profile: {name!r} (have: {', '.join(profiles)})")
+    return {**DEFAULT_PROFILE_SETTINGS, **(profiles[name] or {})}
+
+
+def list_profiles() -> list:
+    profiles = list(config.get("profiles") or {})
+    return profiles if DEFAULT_PROFILE in profiles else [DEFAULT_PROFILE] + profiles
+
+
+def current_profile() -> str:
+    return PROFILE
+
+
+def set_profile(name: str):
     """
-    audio = np.frombuffer(data, dtype=np.float32)
+    Switch profile at runtime. Batching changes immediately; block size and
+    endpointing take effect at the next utterance boundary while listening.
+    """
+    global PROFILE, FEED_BYTES, ENDPOINTER, BLOCK_SIZE, _pending_block_size, _endpointer_generation
+    settings = get_profile(name)
+    PROFILE = name
+    FEED_BYTES = int(settings["feed_ms"] * TARGET_RATE / 1000) * 2  # int16 bytes
+    ENDPOINTER = (settings["endpointer_mode"], settings.get("endpointer_delays"))
+    _endpointer_generation += 1
+
+    block_size = config.audio.get("block_size") or settings["block_size"]
+    if block_size != BLOCK_SIZE:
+        if not _captures:
+            BLOCK_SIZE = block_size
+        else:
+            _pending_block_size = block_size  # reopened at the next utterance boundary
+
+    print(f"[Listener] Profile '{name}': block {block_size}, "
+          f"feed {settings['feed_ms']} ms, endpointer {settings['endpointer_mode']}")
+
+
+def _on_audio_config(audio):
+    set_profile(audio.get("profile", DEFAULT_PROFILE) if audio is not None else DEFAULT_PROFILE)
+
+
+config_service.subscribe("stt", _on_stt_config)
+config_service.subscribe("audio", _on_audio_config)
+config_service.subscribe("profiles", lambda _: set_profile(PROFILE))
+set_profile(config.audio.get("profile", DEFAULT_PROFILE))
 
-    # Reshape into [N, channels]
-    audio = audio.reshape(-1, CHANNELS)
 
-    # Downmix: average L+R channels
-    mono = audio.mean(axis=1)
+# ------------------ Helpers ------------------
+
+def _to_pcm(audio: np.ndarray, samplerate: int, target_rate: int) -> bytes:
+    """
+    Convert float32 frames ([N] or [N, channels]) → mono int16 PCM at target_rate.
+    """
+    # Downmix: average the channels
+    mono = audio.mean(axis=1) if audio.ndim == 2 else audio
 
     # Normalize amplitude to [-1, 1]
     max_val = np.max(np.abs(mono))
@@ -56,56 +228,438 @@ def resample_and_downmix(data: bytes, samplerate: int, target_rate: int) -> byte
     return (resampled * 32767).astype(np.int16).tobytes()
 
 
-def audio_callback(indata, frames, time, status):
+def resample_and_downmix(data: bytes, samplerate: int, target_rate: int) -> bytes:
     """
-    Called automatically when new audio is available.
-    Converts audio and pushes it into the queue.
+    Convert stereo float32 → mono int16 PCM at target_rate (for Vosk).
     """
-    if status:
-        print(f"[Audio Warning] {status}")
+    audio = np.frombuffer(data, dtype=np.float32).reshape(-1, CHANNELS)
+    return _to_pcm(audio, samplerate, target_rate)
+
+
+# ------------------ Sources ------------------
 
-    audio_bytes = resample_and_downmix(indata.tobytes(), MIC_RATE, TARGET_RATE)
-    audio_queue.put(audio_bytes)
+class Source:
+    """
+    One independent speaker stream: a device, or some channels of one.
+
+    Each source has its own queue, recognizer (on the shared model), sample
+    counters and decoding thread, and tags its events with its name.
+    """
+
+    def __init__(self, name, device=None, channels=None):
+        self.name = name
+        self.device = device        # sounddevice device name/index, None = default input
+        self.channels = channels    # input channel indices to mix, None = all opened
+        self.queue = queue.Queue(maxsize=SOURCE_QUEUE_SIZE)
+        self.blocks_in = 0
+        self.blocks_dropped = 0
+        self.capture_path = None    # native / convert / resample, set by its Capture
+        self.archive = None         # optional halo.core.archive.AudioArchive
+        self.recognizer = None
+        self.thread = None
+        self._model_gen = -1
+        self._endpointer_gen = -1
+        self.reset()
+
+    def reset(self):
+        self.samples_fed = 0
+        self.utterance_start = 0
+        self._feed_buffer = []
+        self._feed_buffered = 0
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+    def push(self, pcm: bytes):
+        """Queue one block of 16 kHz mono int16 PCM (from the capture callback)."""
+        self.blocks_in += 1
+        try:
+            self.queue.put_nowait(pcm)
+        except queue.Full:
+            self.blocks_dropped += 1  # recognizer is behind; never block the callback
+
+    # ---- recognizer thread ----
+
+    def _ensure_recognizer(self):
+        """(Re)build or reconfigure the recognizer if the model or profile changed."""
+        if self.recognizer is None or self._model_gen != _model_generation:
+            had_one = self.recognizer is not None
+            self._model_gen = _model_generation
+            self._endpointer_gen = _endpointer_generation
+            self.recognizer = _new_recognizer()
+            if had_one:
+                gc.collect()  # release the old recognizer (and model, if last)
+        elif self._endpointer_gen != _endpointer_generation:
+            self._endpointer_gen = _endpointer_generation
+            _configure_recognizer(self.recognizer)
+
+    def _at_utterance_boundary(self):
+        """Apply any queued reconfiguration while no utterance is in flight."""
+        self._ensure_recognizer()
+        _apply_pending_block_size()
+
+    def _batch(self, data: bytes):
+        """
+        Collect blocks until the profile's feed size is reached.
+        Returns the bytes to feed now, or None to keep waiting.
+        """
+        self._feed_buffer.append(data)
+        self._feed_buffered += len(data)
+        if self._feed_buffered < FEED_BYTES:
+            return None
+        batch = b"".join(self._feed_buffer)  # no copy when only one block is held
+        self._feed_buffer.clear()
+        self._feed_buffered = 0
+        return batch
+
+    def _feed_position(self, data: bytes):
+        """Advance the sample counter and archive the block, if enabled."""
+        if self.archive is not None:
+            self.archive.write(data)
+        self.samples_fed += len(data) // 2  # int16 mono
+
+    def _final(self, text: str) -> dict:
+        """Final event tagged with its source and the samples it covers."""
+        event = {
+            "type": "final", "text": text, "source": self.name,
+            "start_sample": self.utterance_start, "end_sample": self.samples_fed,
+            "start": self.utterance_start / TARGET_RATE, "end": self.samples_fed / TARGET_RATE,
+        }
+        self.utterance_start = self.samples_fed
+        return event
+
+    def _drain_and_finalize(self):
+        """
+        Feed whatever is still queued into the recognizer and flush it.
+        Returns the final text of the utterance cut by the pause (may be empty).
+        """
+        while True:
+            try:
+                self._feed_buffer.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        if self._feed_buffer:
+            data = b"".join(self._feed_buffer)
+            self._feed_buffer.clear()
+            self._feed_buffered = 0
+            self._feed_position(data)
+            self.recognizer.AcceptWaveform(data)
+        result = json.loads(self.recognizer.FinalResult())
+        return result.get("text", "").strip()
+
+    def run(self):
+        """Decode this source until stopped, posting events to `_results`."""
+        self._ensure_recognizer()
+        while not stop_listening:
+            if not _resume_event.is_set():
+                # Paused: capture is already stopped, close the open utterance
+                # and block until resumed (or stopped) without polling.
+                text = self._drain_and_finalize()
+                self._at_utterance_boundary()
+                event = self._final(text)
+                if text:
+                    _results.put(event)
+                _resume_event.wait()
+                continue
+
+            try:
+                data = self.queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            data = self._batch(data)
+            if data is None:
+                continue
+            self._feed_position(data)
+            profiling.count("blocks_processed")
+            if self.recognizer.AcceptWaveform(data):
+                result = json.loads(self.recognizer.Result())
+                self._at_utterance_boundary()
+                text = result.get("text", "").strip()
+                event = self._final(text)  # advances the segment start even on silence
+                if text:
+                    _results.put(event)
+            else:
+                partial = json.loads(self.recognizer.PartialResult())
+                text = partial.get("partial", "").strip()
+                if text:
+                    _results.put({"type": "partial", "text": text, "source": self.name})
+
+
+class Capture:
+    """
+    One InputStream on a device, fanning each block out to its sources.
+
+    At open time it asks the device for the cheapest format that still
+    gives each source what it needs (see _negotiate):
+      native    16 kHz int16 mono: callback bytes go straight to the queue
+      convert   16 kHz int16, several channels: channel pick/mix only
+      resample  MIC_RATE float32: downmix + normalize + resample (original path)
+    """
+
+    def __init__(self, device, sources):
+        self.device = device
+        self.sources = sources
+        self.channels = self._channel_count()
+        self.path, self.samplerate, self.dtype, self.stream_channels = self._negotiate()
+        self.stream = None
+        for source in sources:
+            source.capture_path = self.path
+        self.open()
+        self.block_cost_ms = self._measure_block_cost()
+        print(f"[Listener] Capture {self.device or 'default'}: {self.path} path "
+              f"({self.samplerate} Hz {self.dtype} x{self.stream_channels}), "
+              f"{self.frames_per_block()} frames/block, {self.block_cost_ms:.3f} ms/block to convert")
+
+    def _channel_count(self):
+        needed = [max(s.channels) + 1 for s in self.sources if s.channels]
+        if any(not s.channels for s in self.sources):
+            available = sd.query_devices(self.device, "input")["max_input_channels"]
+            needed.append(min(CHANNELS, available))
+        return max(needed)
+
+    def _negotiate(self):
+        """Pick the first (cheapest) format the device accepts."""
+        candidates = []
+        if config.audio.get("native_format", True):
+            # Mono is enough when every source is a "mix" or only wants channel 0
+            if all(not s.channels or s.channels == [0] for s in self.sources):
+                candidates.append(("native", TARGET_RATE, "int16", 1))
+            candidates.append(("convert", TARGET_RATE, "int16", self.channels))
+        candidates.append(("resample", MIC_RATE, "float32", self.channels))
+
+        for path, rate, dtype, channels in candidates:
+            try:
+                sd.check_input_settings(device=self.device, channels=channels,
+                                        dtype=dtype, samplerate=rate)
+                return path, rate, dtype, channels
+            except Exception:
+                continue
+        return candidates[-1]  # let InputStream report the real error
+
+    def frames_per_block(self):
+        """BLOCK_SIZE is in MIC_RATE frames; keep the same duration at other rates."""
+        return BLOCK_SIZE * self.samplerate // MIC_RATE
+
+    def open(self):
+        stream_type = sd.RawInputStream if self.path == "native" else sd.InputStream
+        self.stream = stream_type(
+            device=self.device,
+            samplerate=self.samplerate,
+            channels=self.stream_channels,
+            blocksize=self.frames_per_block(),
+            dtype=self.dtype,
+            callback=self.callback
+        )
+
+    def _convert(self, source, indata) -> bytes:
+        """16 kHz mono int16 PCM for one source from one callback block."""
+        if self.path == "native":
+            return bytes(indata)  # already what Vosk wants; copy out of the callback buffer
+        block = indata if source.channels is None else indata[:, source.channels]
+        if self.path == "convert":
+            if block.shape[1] == 1:
+                return block.tobytes()
+            return block.mean(axis=1).astype(np.int16).tobytes()
+        return _to_pcm(block, MIC_RATE, TARGET_RATE)
+
+    def _measure_block_cost(self, repeats=20):
+        """Median time to convert one silent block for every source, in ms."""
+        frames = self.frames_per_block()
+        if self.path == "native":
+            block = bytes(frames * 2)
+        else:
+            block = np.zeros((frames, self.stream_channels), dtype=self.dtype)
+            block[0] = 1  # avoid the all-zero fast path in normalization
+        timings = []
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            for source in self.sources:
+                self._convert(source, block)
+            timings.append(time.perf_counter() - t0)
+        return 1000 * sorted(timings)[len(timings) // 2]
+
+    def callback(self, indata, frames, time_info, status):
+        """
+        Called automatically when new audio is available.
+        Converts audio per source and pushes it into that source's queue.
+        """
+        if status:
+            print(f"[Audio Warning] {self.device or 'default'}: {status}")
+        for source in self.sources:
+            source.push(self._convert(source, indata))
+
+    def reopen(self):
+        """Recreate the InputStream with the current BLOCK_SIZE, keeping its state."""
+        was_active = self.stream.active
+        self.close()
+        self.open()
+        if was_active:
+            self.stream.start()
+
+    def close(self):
+        self.stream.stop()
+        self.stream.close()
+
+
+def _build_sources():
+    """
+    Sources from audio.sources in settings.yaml; with none configured, one
+    "mix" source averages the default mic's channels (the original behaviour).
+    """
+    specs = config.audio.get("sources") or []
+    if not specs:
+        return [Source("mix")]
+    return [Source(s["name"], s.get("device"), s.get("channels")) for s in specs]
+
+
+def _apply_pending_block_size():
+    global BLOCK_SIZE, _pending_block_size
+    with _capture_lock:
+        if _pending_block_size is None:
+            return
+        BLOCK_SIZE, _pending_block_size = _pending_block_size, None
+        # Other sources on a shared device may lose a few ms mid-utterance
+        for capture in _captures:
+            capture.reopen()
+    print(f"[Listener] Capture block size is now {BLOCK_SIZE}")
 
 
 # ------------------ Main API ------------------
 
-def start_stream():
+def start_stream(paused=False):
     """
-    Starts the microphone stream and returns the InputStream.
+    Opens and starts capture for every configured source (only opens it if
+    `paused`, so a pause requested before the session started holds).
+    Returns the list of InputStreams.
     """
-    return sd.InputStream(
-        samplerate=MIC_RATE,
-        channels=CHANNELS,
-        blocksize=BLOCK_SIZE,
-        dtype="float32",
-        callback=audio_callback
-    )
+    global _sources, _captures, stop_listening
+    close_stream()
+    stop_listening = False
+    if paused:
+        _resume_event.clear()
+    else:
+        _resume_event.set()
+    while not _results.empty():
+        _results.get_nowait()
+
+    _sources = _build_sources()
+    by_device = {}
+    for source in _sources:
+        by_device.setdefault(source.device, []).append(source)
+    with _capture_lock:
+        _captures = [Capture(device, sources) for device, sources in by_device.items()]
+        if not paused:
+            for capture in _captures:
+                capture.stream.start()
+    return [capture.stream for capture in _captures]
+
+
+def source_names() -> list:
+    """Names of the active sources (or the configured ones before starting)."""
+    return [s.name for s in (_sources or _build_sources())]
+
+
+def source_stats() -> dict:
+    """Per-source capture queue depth and block counts."""
+    return {
+        s.name: {
+            "capture_path": s.capture_path,
+            "depth": s.queue.qsize(),
+            "capacity": s.queue.maxsize,
+            "blocks_in": s.blocks_in,
+            "blocks_dropped": s.blocks_dropped,
+            "samples_fed": s.samples_fed,
+        }
+        for s in _sources
+    }
+
+
+def set_archive(archive, source=None):
+    """Archive every block fed to a source's recognizer (None to disable)."""
+    for s in _sources:
+        if source is None or s.name == source:
+            s.archive = archive
+            if source is None:
+                break  # default: the first (usually only) source
+
+
+def close_stream():
+    """Stop and close every active InputStream and forget the session's sources."""
+    global _captures, _sources
+    with _capture_lock:
+        for capture in _captures:
+            capture.close()
+        _captures = []
+        _sources = []  # source_names() reads the config again until the next start
 
 
 def listen_continuous():
     """
-    Generator that yields dicts with type + text.
+    Generator that yields dicts with type + text + source.
     Example:
-        {"type": "partial", "text": "hel"}
-        {"type": "final", "text": "hello world"}
+        {"type": "partial", "text": "hel", "source": "mix"}
+        {"type": "final", "text": "hello world", "source": "mix", ...}
+
+    Each source decodes on its own thread. Partials pass straight through,
+    and so do finals with a single source; with several, finals are merged
+    in order of utterance start (see REORDER_WINDOW).
     """
     global stop_listening
-    while not stop_listening:
-        if not audio_queue.empty():
-            data = audio_queue.get()
-            if recognizer.AcceptWaveform(data):
-                result = json.loads(recognizer.Result())
-                text = result.get("text", "").strip()
-                if text:
-                    yield {"type": "final", "text": text}
-            else:
-                partial = json.loads(recognizer.PartialResult())
-                text = partial.get("partial", "").strip()
-                if text:
-                    yield {"type": "partial", "text": text}
-        else:
-            sd.sleep(10)  # small sleep to avoid busy waiting
+    load_model()  # no-op if already loaded in the background
+    sources = _sources  # this session's, even if close_stream() runs meanwhile
+    for source in sources:
+        source.thread = threading.Thread(
+            target=source.run, name=f"recognizer-{source.name}", daemon=True
+        )
+        source.thread.start()
+
+    held = []   # heap of (utterance start, seq, arrival time, event)
+    seq = itertools.count()
+    last_seq = {s.name: -1 for s in sources}     # seq of each source's latest event
+    speaking = {s.name: False for s in sources}  # partial seen since its last final
+    threads = {s.name: s.thread for s in sources}
+
+    def caught_up(entry):
+        """Every other source has moved past this final or has nothing open."""
+        _, entry_seq, _, event = entry
+        return all(
+            name == event["source"] or not speaking[name]
+            or last_seq[name] > entry_seq or not threads[name].is_alive()
+            for name in last_seq
+        )
+
+    try:
+        while True:
+            try:
+                event = _results.get(timeout=0.1)
+            except queue.Empty:
+                event = None
+                if not any(s.thread.is_alive() for s in sources):
+                    break
+
+            if event is not None:
+                n = next(seq)
+                last_seq[event["source"]] = n
+                speaking[event["source"]] = event["type"] == "partial"
+                if event["type"] == "partial" or len(sources) == 1:
+                    yield event  # nothing to reorder against
+                else:
+                    heapq.heappush(held, (event["start"], n, time.monotonic(), event))
+
+            # Release finals once the other sources caught up, their window
+            # passed, or on pause/stop
+            flush = stop_listening or not _resume_event.is_set()
+            now = time.monotonic()
+            while held and (flush or caught_up(held[0]) or now - held[0][2] >= REORDER_WINDOW):
+                yield heapq.heappop(held)[3]
+
+        while held:
+            yield heapq.heappop(held)[3]
+    finally:
+        stop_listening = True
+        _resume_event.set()
+        for source in sources:
+            source.thread.join(timeout=1.0)
 
 
 def stop_streaming():
@@ -114,3 +668,34 @@ def stop_streaming():
     """
     global stop_listening
     stop_listening = True
+    _resume_event.set()  # wake recognizer threads parked on pause
+
+
+def pause_streaming():
+    """
+    Suspend capture: stop every InputStream so no callbacks, resampling or
+    decoding happen while paused. Streams stay open for a fast resume.
+    """
+    with _capture_lock:
+        if not _resume_event.is_set():
+            return
+        # Streams first: stop() waits for a running callback to finish, so
+        # the recognizer threads flush everything captured before the pause
+        # and nothing captured after it
+        for capture in _captures:
+            if capture.stream.active:
+                capture.stream.stop()
+        _resume_event.clear()
+
+
+def resume_streaming():
+    """
+    Restart capture on the existing streams; the model is not reloaded.
+    """
+    with _capture_lock:
+        if _resume_event.is_set():
+            return
+        for capture in _captures:
+            if not capture.stream.active:
+                capture.stream.start()
+        _resume_event.set()
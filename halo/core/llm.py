@@ -1,5 +1,16 @@
-from ollama import chat
-from halo.utils.config_loader import config
+from halo.utils.config_loader import config, config_service
+
+_chat = None
+
+
+def _get_chat():
+    """Import the ollama client on first use (it pulls in httpx/pydantic)."""
+    global _chat
+    if _chat is None:
+        from ollama import chat
+        _chat = chat
+    return _chat
+
 
 class OllamaSession:
     def __init__(self, model=None):
@@ -10,7 +21,7 @@ class OllamaSession:
         """Stream tokens as they arrive (generator)."""
         messages = [{"role": "user", "content": prompt}]
         try:
-            for token in chat(model=self.model, messages=messages, stream=True):
+            for token in _get_chat()(model=self.model, messages=messages, stream=True):
                 yield token.get("message", {}).get("content", "")
         except Exception as e:
             yield f"[Error] {str(e)}"
@@ -19,7 +30,7 @@ class OllamaSession:
         """Return full response as a string."""
         messages = [{"role": "user", "content": prompt}]
         try:
-            response = chat(model=self.model, messages=messages, stream=False)
+            response = _get_chat()(model=self.model, messages=messages, stream=False)
             return response.get("message", {}).get("content", "")
         except Exception as e:
             return f"[Error] {str(e)}"
@@ -27,6 +38,28 @@ class OllamaSession:
 # Global persistent session for Halo
 ollama_session = OllamaSession(model=config.llm.model)
 
+
+def _on_llm_config(llm):
+    """New default model applies to the next query; running streams keep theirs."""
+    if llm is not None and llm.get("model") and llm.model != ollama_session.model:
+        ollama_session.model = llm.model
+        print(f"[OllamaSession] Default model is now: {llm.model}")
+
+
+config_service.subscribe("llm", _on_llm_config)
+
+def warm_up(model=None):
+    """
+    Import the client and ask Ollama to load the model into memory so the
+    first real query does not pay for it. Returns (ok, message).
+    """
+    model = model or config.llm.model
+    try:
+        _get_chat()(model=model, messages=[])
+        return True, model
+    except Exception as e:
+        return False, str(e)
+
 def query_ollama(prompt, stream=False, model=None):
     """
     Wrapper function for querying Ollama.
@@ -0,0 +1,101 @@
+# halo/core/pcm_ring.py
+"""
+Shared-memory ring buffer carrying PCM blocks between processes
+(used by halo/core/recognizer_process.py).
+
+Layout: [32-byte header][capacity bytes of records]
+    header  capacity u64 | write_pos u64 | read_pos u64 | dropped records u64
+    record  source index u16 | payload bytes u32 | start sample u64 | payload
+"""
+
+import struct
+import threading
+from multiprocessing import shared_memory
+
+RING_BYTES = 2 * 1024 * 1024    # ~65 s of 16 kHz int16 for one source
+
+RING_HEADER = struct.Struct("<QQQQ")    # capacity, write_pos, read_pos, dropped records
+RING_RECORD = struct.Struct("<HIQ")     # source index, payload bytes, start sample
+
+
+class PcmRing:
+    """
+    Byte ring in shared memory: writers in one process, one reader in another.
+
+    Positions only grow; a writer publishes write_pos after the record is
+    complete, so the reader never sees half a record even if the writer dies.
+    Writers (one recognizer thread per source) serialize on a lock around
+    reserve → copy → publish. A record that does not fit is dropped (and
+    counted) instead of blocking.
+    """
+
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner
+        self.name = shm.name
+        self.buf = shm.buf
+        self.capacity = RING_HEADER.unpack_from(self.buf, 0)[0]
+        self._write_lock = threading.Lock()
+
+    @classmethod
+    def create(cls, capacity=RING_BYTES):
+        shm = shared_memory.SharedMemory(create=True, size=RING_HEADER.size + capacity)
+        RING_HEADER.pack_into(shm.buf, 0, capacity, 0, 0, 0)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+        except TypeError:
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, owner=False)
+
+    def _put(self, pos, data):
+        data = memoryview(data).cast("B")
+        offset = RING_HEADER.size + pos % self.capacity
+        first = min(len(data), RING_HEADER.size + self.capacity - offset)
+        self.buf[offset:offset + first] = data[:first]
+        if first < len(data):
+            self.buf[RING_HEADER.size:RING_HEADER.size + len(data) - first] = data[first:]
+
+    def _get(self, pos, size) -> bytes:
+        offset = RING_HEADER.size + pos % self.capacity
+        first = min(size, RING_HEADER.size + self.capacity - offset)
+        data = bytes(self.buf[offset:offset + first])
+        if first < size:
+            data += bytes(self.buf[RING_HEADER.size:RING_HEADER.size + size - first])
+        return data
+
+    def write(self, index: int, start: int, pcm) -> bool:
+        """Append one block for source `index`; False if the ring is full."""
+        size = RING_RECORD.size + len(pcm)
+        with self._write_lock:
+            _, write_pos, read_pos, dropped = RING_HEADER.unpack_from(self.buf, 0)
+            if size > self.capacity - (write_pos - read_pos):
+                struct.pack_into("<Q", self.buf, 24, dropped + 1)
+                return False
+            self._put(write_pos, RING_RECORD.pack(index, len(pcm), start))
+            self._put(write_pos + RING_RECORD.size, pcm)
+            struct.pack_into("<Q", self.buf, 8, write_pos + size)
+        return True
+
+    def read(self):
+        """Yield (source index, start sample, pcm) for everything written so far."""
+        _, write_pos, read_pos, _ = RING_HEADER.unpack_from(self.buf, 0)
+        while read_pos < write_pos:
+            index, length, start = RING_RECORD.unpack(self._get(read_pos, RING_RECORD.size))
+            pcm = self._get(read_pos + RING_RECORD.size, length)
+            read_pos += RING_RECORD.size + length
+            struct.pack_into("<Q", self.buf, 16, read_pos)
+            yield index, start, pcm
+
+    def stats(self) -> dict:
+        capacity, write_pos, read_pos, dropped = RING_HEADER.unpack_from(self.buf, 0)
+        return {"capacity": capacity, "used": write_pos - read_pos, "dropped": dropped}
+
+    def close(self):
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -3,7 +3,11 @@
 import os
 import datetime
 import json
-from halo.core.listener import start_stream, listen_continuous, stop_streaming
+import threading
+from halo.core.bus import EventBus
+from halo.core import listener
+from halo.utils import profiling
+from halo.utils.config_loader import config
 
 # ----------------- Transcript Cache -----------------
 _transcript_cache = []
@@ -16,6 +20,21 @@ os.makedirs(TRANSCRIPTS_DIR, exist_ok=True)
 _session_counter = 0
 TRANSCRIPT_FILE = None
 
+# Where capture + recognition run: halo.core.listener in this process, or
+# halo.core.recognizer_process (same functions) when stt.process is set.
+# Chosen each time recording starts.
+_backend = listener
+
+# Pause requested in this session. Kept here rather than in the backend so a
+# Pause clicked before the recording thread has started capture still holds.
+_paused = False
+_pause_lock = threading.Lock()
+
+
+def _use_process() -> bool:
+    stt = getattr(config, "stt", None)
+    return bool(stt is not None and stt.get("process", False))
+
 
 def _new_session_file():
     """
@@ -34,41 +53,261 @@ def _new_session_file():
     return TRANSCRIPT_FILE
 
 
-def _save_to_file(text: str):
-    """Append a single line to the active transcript file."""
-    if not TRANSCRIPT_FILE:
-        _new_session_file()  # lazy init if not created yet
-    with open(TRANSCRIPT_FILE, "a", encoding="utf-8") as f:
+def _save_to_file(text: str, path=None):
+    """Append a single line to a transcript file (the active one by default)."""
+    if path is None:
+        if not TRANSCRIPT_FILE:
+            _new_session_file()  # lazy init if not created yet
+        path = TRANSCRIPT_FILE
+    with open(path, "a", encoding="utf-8") as f:
         f.write(text + "\n")
+    profiling.count("bytes_written", len(text.encode("utf-8")) + 1)
+
+
+class _Recording:
+    """
+    Everything the stages write for one recording, fixed when it starts.
+    Its finals and "stopped" carry it, so events still queued in a stage
+    when the next recording starts never touch the new transcript/archives.
+    """
+
+    def __init__(self, backend):
+        if not TRANSCRIPT_FILE:
+            _new_session_file()
+        self.backend = backend
+        self.transcript_file = TRANSCRIPT_FILE
+        self.cache = _transcript_cache
+        self.names = backend.source_names()
+        self.multi_source = len(self.names) > 1
+        self.archives = {}   # raw audio per source (see halo/core/archive.py)
+
+    def open_archives(self):
+        """
+        Open a raw audio archive per source next to the session's transcript
+        name, if `archive.enabled` is set. With a single source the file is
+        <session>.pcm, otherwise <session>-<source>.pcm.
+        """
+        archive_cfg = getattr(config, "archive", None)
+        if archive_cfg is None or not archive_cfg.get("enabled", False):
+            return
+
+        from halo.core.archive import AudioArchive
+        base = os.path.splitext(os.path.basename(self.transcript_file))[0]
+        for source in self.names:
+            name = f"{base}.pcm" if not self.multi_source else f"{base}-{source}.pcm"
+            self.archives[source] = AudioArchive(
+                os.path.join(archive_cfg.get("dir", os.path.join("data", "audio")), name),
+                initial_seconds=archive_cfg.get("initial_minutes", 10) * 60,
+            )
+            self.backend.set_archive(self.archives[source], source)
+
+    def detach_archives(self):
+        """Stop feeding the archives (on the recognize thread, before "stopped")."""
+        for source in self.archives:
+            self.backend.set_archive(None, source)
+
+    def close_archives(self):
+        for archive in self.archives.values():
+            archive.close()
+        self.archives.clear()
+
+    def line(self, event):
+        """Transcript line for a final; tagged with its source when there are several."""
+        return f"{event['source']}: {event['text']}" if self.multi_source else event["text"]
 
 
 def start_new_session():
     """Explicitly start a new transcript session."""
+    global _paused
+    with _pause_lock:
+        _paused = False
     return _new_session_file()
 
 
+# ----------------- Event bus -----------------
+# Stages, each with its own bounded queue and thread:
+#   capture + recognize  listener threads (or the recognizer process), drained
+#                        by _recognize → "partial" / "final"
+#   persist              finals → transcript file + archive segment index
+#   index                finals → transcript cache, republished as "transcript"
+#   llm                  "transcript" → registered LLM triggers
+#   ui / socket / ...    subscribe to "partial" + "transcript"
+# "stopped" marks the end of recognition; index forwards it as "end" once
+# everything before it is cached, which ends subscriptions.
+bus = EventBus()
+_recognize_thread = None
+_stages = []
+_llm_triggers = []
+
+
+def _recognize(recording):
+    """Drain the listener and publish its events (runs on its own thread)."""
+    try:
+        for result in recording.backend.listen_continuous():
+            text = result["text"].strip()
+            if text:
+                profiling.count(f"{result['type']}s_emitted")  # partials_emitted / finals_emitted
+                event = {**result, "text": text}
+                if result["type"] == "final":
+                    event["recording"] = recording  # stripped again by _index
+                bus.publish(result["type"], event)
+    finally:
+        recording.backend.close_stream()  # the listener may have reopened streams after a config change
+        recording.detach_archives()
+        bus.publish("stopped", {"type": "stopped", "recording": recording})
+
+
+def _persist(topic, event):
+    recording = event["recording"]
+    if topic == "stopped":
+        recording.close_archives()
+        return
+    _save_to_file(recording.line(event), recording.transcript_file)
+    archive = recording.archives.get(event.get("source"))
+    if archive is not None:
+        archive.mark_segment(event["start_sample"], event["end_sample"], event["text"])
+
+
+def _index(topic, event):
+    event = dict(event)
+    recording = event.pop("recording")  # subscribers get plain, serializable events
+    if topic == "stopped":
+        bus.publish("end", event)
+        return
+    recording.cache.append(recording.line(event))
+    bus.publish("transcript", event)
+
+
+def _run_llm_triggers(topic, event):
+    for trigger in list(_llm_triggers):
+        trigger(event)
+
+
+def _ensure_stages():
+    if not _stages:
+        _stages.append(bus.subscribe("persist", _persist, ["final", "stopped"], maxsize=1024))
+        _stages.append(bus.subscribe("index", _index, ["final", "stopped"], maxsize=1024))
+        _stages.append(bus.subscribe("llm", _run_llm_triggers, ["transcript"], maxsize=64))
+
+
+def add_llm_trigger(callback):
+    """
+    Call `callback(final_event)` for every new transcript line, on the llm
+    stage's thread (so a slow model never delays recognition or the UI).
+    """
+    _llm_triggers.append(callback)
+
+
+def start_pipeline():
+    """Open capture and start the recognize stage. No-op if already running."""
+    global _recognize_thread, _backend
+    if _recognize_thread is not None and _recognize_thread.is_alive():
+        return
+    _ensure_stages()
+    with _pause_lock:
+        if _use_process():
+            from halo.core import recognizer_process
+            _backend = recognizer_process
+        else:
+            _backend = listener
+        _backend.start_stream(paused=_paused)
+    recording = _Recording(_backend)
+    recording.open_archives()
+    _recognize_thread = threading.Thread(target=_recognize, args=(recording,),
+                                         name="recognize", daemon=True)
+    _recognize_thread.start()
+
+
+def stop_pipeline(timeout=2.0):
+    """Stop capture and recognition; stages finish what is already queued."""
+    stop_recording()
+    if _recognize_thread is not None and _recognize_thread is not threading.current_thread():
+        _recognize_thread.join(timeout=timeout)
+
+
+def stop_recording():
+    """Ask capture and recognition to stop without waiting (safe from any thread)."""
+    _backend.stop_streaming()
+
+
+def load_recognizer():
+    """
+    Load the speech model ahead of the first Listen. With stt.process set
+    the child process loads its own copy, so there is nothing to do here.
+    """
+    if not _use_process():
+        listener.load_model()
+
+
+def pipeline_stats():
+    """
+    Queue depths and throughput of every stage, per-source capture queues
+    and the always-on counters (see halo/utils/profiling.py).
+    """
+    stats = bus.stats()
+    stats["sources"] = _backend.source_stats()
+    stats["counters"] = profiling.counters()
+    if _backend is not listener:
+        stats["process"] = _backend.process_stats()
+    return stats
+
+
+def health_summary() -> str:
+    """One-screen text summary of counters, stage queues and sources."""
+    stats = pipeline_stats()
+    return profiling.health_summary(stats, (stats.get("process") or {}).get("counters"))
+
+
+def set_profiling(enabled: bool):
+    """
+    Start or stop the sampling profiler. With stt.process set the
+    recognizer process is profiled too and writes its own reports.
+    """
+    if enabled:
+        profiling.start_profiling()
+    else:
+        profiling.stop_profiling()
+    if _backend is not listener:
+        _backend.set_profiling(enabled)
+
+
 def record_continuous():
     """
     Start continuous recording and yield both partial + final transcripts.
     - Partials are yielded to UI only (not saved).
-    - Finals are saved + cached + yielded to AI.
-    """
-    stream = start_stream()
-    stream.start()
+    - Finals are saved + cached (by their own stages) before being yielded.
+    - With several sources, saved lines are tagged "<source>: text".
 
+    This is a bus subscription, so other consumers can listen to the same
+    session at the same time.
+    """
+    subscription = bus.subscription("ui", ["partial", "transcript"])
+    start_pipeline()
     try:
-        for result in listen_continuous():
-            if result["type"] == "final" and result["text"].strip():
-                _transcript_cache.append(result["text"])
-                _save_to_file(result["text"])
-                yield {"type": "final", "text": result["text"]}
-            elif result["type"] == "partial" and result["text"].strip():
-                # only stream out, don't save or cache
-                yield {"type": "partial", "text": result["text"]}
+        for event in subscription:
+            yield event
     finally:
-        stop_streaming()
-        stream.stop()
-        stream.close()
+        subscription.close()
+        stop_pipeline()
+
+
+def pause_recording():
+    """
+    Pause the active recording. Capture and decoding stop completely; the
+    utterance in progress is finalized and saved like any other final.
+    """
+    global _paused
+    with _pause_lock:
+        _paused = True
+        _backend.pause_streaming()
+
+
+def resume_recording():
+    """Resume a paused recording on the same streams and model."""
+    global _paused
+    with _pause_lock:
+        _paused = False
+        _backend.resume_streaming()
 
 
 def get_transcript_context():
@@ -0,0 +1,344 @@
+# halo/core/recognizer_process.py
+"""
+Capture + recognition in a child process (`stt.process: true`).
+
+The child runs the normal listener (InputStreams, per-source recognizer
+threads, final merging) in its own interpreter, so the Vosk decoder and
+the audio callback no longer compete with Qt redraws or LLM streaming for
+the GIL. The parent only sees:
+
+    events pipe   child → parent  ("event", {...}) / ("stats", {...}) / ...
+    command pipe  parent → child  ("pause"|"resume"|"stop"|"profile", arg)
+    PcmRing       child → parent  PCM fed to each recognizer, for the archive
+
+This module exposes the same functions the pipeline uses from
+halo.core.listener (start_stream, listen_continuous, stop_streaming, ...),
+so record_continuous() behaves the same either way. If the child dies,
+listen_continuous() restarts it and keeps going.
+"""
+
+import multiprocessing as mp
+import signal
+import threading
+import time
+
+from halo.core import listener
+from halo.core.pcm_ring import PcmRing
+from halo.utils import profiling
+from halo.utils.config_loader import config
+
+STOP_TIMEOUT = 3.0              # seconds to wait for a clean exit before terminate()
+STATS_INTERVAL = 1.0            # how often the child reports source stats
+MAX_RESTARTS = 3                # crashes tolerated within RESTART_WINDOW
+RESTART_WINDOW = 60.0
+
+# ------------------ Child process ------------------
+
+class _RingTap:
+    """Stands in for a source's AudioArchive in the child: mirrors PCM into the ring."""
+
+    def __init__(self, ring, index):
+        self.ring = ring
+        self.index = index
+        self.samples = 0
+
+    def write(self, pcm):
+        start = self.samples
+        self.samples += len(pcm) // 2  # counted even if dropped, so the parent can pad the gap
+        self.ring.write(self.index, start, pcm)
+        return start
+
+
+def _serve_commands(commands, send):
+    """Child side: apply commands from the parent, report stats while idle."""
+    while True:
+        try:
+            ready = commands.poll(STATS_INTERVAL)
+            cmd, arg = commands.recv() if ready else (None, None)
+        except (EOFError, OSError):
+            cmd, arg = "stop", None  # parent went away
+        if cmd == "stop":
+            listener.stop_streaming()
+            return
+        if cmd == "pause":
+            listener.pause_streaming()
+        elif cmd == "resume":
+            listener.resume_streaming()
+        elif cmd == "profile":
+            listener.set_profile(arg)
+        elif cmd == "profiling":
+            if arg:
+                profiling.start_profiling(label="recognizer")
+            else:
+                profiling.stop_profiling()
+        send("stats", {"sources": listener.source_stats(), "counters": profiling.counters()})
+
+
+def _child_main(ring_name, events, commands, profile, archived, paused):
+    """Entry point of the recognizer process."""
+    from halo.utils.config_loader import config_service
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C is handled by the parent
+    lock = threading.Lock()
+
+    def send(kind, payload):
+        with lock:
+            events.send((kind, payload))
+
+    ring = PcmRing.attach(ring_name)
+    profiling.start_from_env(label="recognizer")
+    try:
+        if profile != listener.current_profile():
+            listener.set_profile(profile)
+        config_service.start_watching()
+        listener.start_stream(paused=paused)
+        names = listener.source_names()
+        if archived:
+            for index, name in enumerate(names):
+                listener.set_archive(_RingTap(ring, index), name)
+        send("ready", names)
+        threading.Thread(target=_serve_commands, args=(commands, send),
+                         name="recognizer-commands", daemon=True).start()
+
+        for event in listener.listen_continuous():
+            send("event", event)
+        send("stats", {"sources": listener.source_stats(), "counters": profiling.counters()})
+    finally:
+        listener.close_stream()
+        profiling.stop_profiling()  # the child exits without running atexit
+        try:
+            send("stopped", None)
+        except OSError:
+            pass
+        ring.close()
+
+
+# ------------------ Parent side ------------------
+
+class RecognizerProcess:
+    """Starts, talks to, restarts and stops the recognizer child process."""
+
+    def __init__(self):
+        self.ring = None
+        self.process = None
+        self.events = None
+        self.commands = None
+        self.names = []
+        self.stats = {}
+        self.counters = {}          # the child's always-on counters
+        self.archives = {}          # source name → AudioArchive, fed from the ring
+        self.restarts = 0
+        self._crashes = []
+        self._base = {}             # sample offset per source, carried over restarts
+        self._last = {}             # highest sample seen per source
+        self._paused = False
+        self._stopping = False
+        self._profile = None
+        self._send_lock = threading.Lock()
+
+    def start(self, paused=False):
+        self.shutdown()
+        self.names, self.stats, self.counters, self.restarts = [], {}, {}, 0
+        self._crashes, self._base, self._last = [], {}, {}
+        self._paused, self._stopping = paused, False
+        self.ring = PcmRing.create()
+        self._spawn()
+
+    def _spawn(self):
+        ctx = mp.get_context("spawn")  # never fork the Qt/PortAudio state
+        events_recv, events_send = ctx.Pipe(duplex=False)
+        commands_recv, commands_send = ctx.Pipe(duplex=False)
+        archived = bool((config.get("archive") or {}).get("enabled", False))
+        self._profile = listener.current_profile()
+        self.process = ctx.Process(
+            target=_child_main, name="halo-recognizer", daemon=True,
+            args=(self.ring.name, events_send, commands_recv, self._profile, archived, self._paused),
+        )
+        self.process.start()
+        events_send.close()     # keep only our ends, so a dead child reads as EOF
+        commands_recv.close()
+        self.events, self.commands = events_recv, commands_send
+        print(f"[Recognizer] Started child process (pid {self.process.pid})")
+        if profiling.is_profiling():
+            self.send("profiling", True)
+
+    def send(self, cmd, arg=None):
+        with self._send_lock:
+            try:
+                if self.commands is not None:
+                    self.commands.send((cmd, arg))
+            except (OSError, ValueError):
+                pass  # child already gone; listen_continuous notices and restarts it
+
+    def stop(self):
+        """Ask the child to stop; listen_continuous() ends once it has flushed."""
+        self._stopping = True
+        self.send("stop")
+
+    def pause(self):
+        self._paused = True
+        self.send("pause")
+
+    def resume(self):
+        self._paused = False
+        self.send("resume")
+
+    def _drain_ring(self):
+        """Append PCM mirrored by the child to each source's archive."""
+        if self.ring is None or not self.names:
+            return
+        for index, start, pcm in self.ring.read():
+            name = self.names[index]
+            start += self._base.get(name, 0)
+            self._last[name] = max(self._last.get(name, 0), start + len(pcm) // 2)
+            archive = self.archives.get(name)
+            if archive is None:
+                continue
+            gap = start - archive.samples_written
+            if gap > 0:
+                archive.write(bytes(2 * gap))  # dropped blocks become silence, keeping offsets
+            archive.write(pcm)
+
+    def _rebase(self, event):
+        """Shift sample positions so they stay continuous across restarts."""
+        base = self._base.get(event["source"], 0)
+        if event["type"] != "final":
+            return event
+        start, end = event["start_sample"] + base, event["end_sample"] + base
+        self._last[event["source"]] = max(self._last.get(event["source"], 0), end)
+        return {**event, "start_sample": start, "end_sample": end,
+                "start": start / listener.TARGET_RATE, "end": end / listener.TARGET_RATE}
+
+    def _restart(self) -> bool:
+        self.process.join(timeout=1.0)
+        now = time.monotonic()
+        self._crashes = [t for t in self._crashes if now - t < RESTART_WINDOW] + [now]
+        if len(self._crashes) > MAX_RESTARTS:
+            print(f"[Recognizer] Child process keeps failing (exit code {self.process.exitcode}); giving up")
+            return False
+        print(f"[Recognizer] Child process exited unexpectedly (exit code {self.process.exitcode}); restarting")
+        self._drain_ring()
+        self._base = dict(self._last)
+        self._close_pipes()
+        self.restarts += 1
+        self._spawn()
+        return True
+
+    def listen_continuous(self):
+        """Yield the child's events like listener.listen_continuous()."""
+        try:
+            while True:
+                self._drain_ring()
+                if listener.current_profile() != self._profile:
+                    self._profile = listener.current_profile()
+                    self.send("profile", self._profile)
+
+                try:
+                    if not self.events.poll(0.1):
+                        if self.process.is_alive():
+                            continue
+                        raise EOFError
+                    kind, payload = self.events.recv()
+                except (EOFError, OSError):
+                    kind, payload = "crashed", None
+
+                if kind == "event":
+                    yield self._rebase(payload)
+                elif kind == "stats":
+                    self.stats, self.counters = payload["sources"], payload["counters"]
+                elif kind == "ready":
+                    self.names = payload
+                elif self._stopping:
+                    break   # "stopped" (or the child exiting) after we asked it to
+                elif not self._restart():
+                    break
+        finally:
+            self._drain_ring()
+            self.shutdown()
+
+    def shutdown(self):
+        """Stop the child (politely, then by force) and release the ring."""
+        self._stopping = True
+        if self.process is not None:
+            self.send("stop")
+            self.process.join(timeout=STOP_TIMEOUT)
+            if self.process.is_alive():
+                print("[Recognizer] Child process did not stop; terminating it")
+                self.process.terminate()
+                self.process.join(timeout=1.0)
+            self.process = None
+        self._close_pipes()
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+    def _close_pipes(self):
+        for conn in (self.events, self.commands):
+            if conn is not None:
+                conn.close()
+        self.events = self.commands = None
+
+
+_process = RecognizerProcess()
+
+
+# ------------------ Listener-compatible API ------------------
+
+def start_stream(paused=False):
+    """Start the recognizer process (it opens capture itself)."""
+    _process.start(paused)
+    return []
+
+
+def listen_continuous():
+    return _process.listen_continuous()
+
+
+def stop_streaming():
+    _process.stop()
+
+
+def close_stream():
+    _process.shutdown()
+
+
+def pause_streaming():
+    _process.pause()
+
+
+def resume_streaming():
+    _process.resume()
+
+
+def set_archive(archive, source=None):
+    """Archive a source's PCM as it arrives over the ring (None to disable)."""
+    names = _process.names or listener.source_names()
+    name = source if source is not None else names[0]
+    if archive is None:
+        _process.archives.pop(name, None)
+    else:
+        _process.archives[name] = archive
+
+
+def source_names() -> list:
+    return _process.names or listener.source_names()
+
+
+def source_stats() -> dict:
+    """Last per-source stats reported by the child."""
+    return _process.stats
+
+
+def process_stats() -> dict:
+    alive = _process.process is not None and _process.process.is_alive()
+    return {
+        "pid": _process.process.pid if alive else None,
+        "restarts": _process.restarts,
+        "ring": _process.ring.stats() if _process.ring is not None else None,
+        "counters": _process.counters,
+    }
+
+
+def set_profiling(enabled: bool):
+    """Start/stop the sampling profiler inside the child too."""
+    _process.send("profiling", enabled)
@@ -1,14 +1,32 @@
 # halo/core/stt.py
 import json
 import vosk
-from halo.utils.config_loader import config
+from halo.utils.config_loader import config, config_service
 
 # ===== CONFIG =====
 TARGET_RATE = 16000  # Vosk always expects 16k mono PCM
 
-# Load Vosk model (make sure you have the correct model downloaded)
+# Vosk model (make sure you have the correct model downloaded); loaded on first use
 MODEL_PATH = getattr(config.stt, "model_path", None)
-vosk_model = vosk.Model(MODEL_PATH)
+vosk_model = None
+
+
+def _get_model():
+    global vosk_model
+    if vosk_model is None:
+        vosk_model = vosk.Model(MODEL_PATH)
+    return vosk_model
+
+
+def _on_stt_config(stt):
+    """Drop the cached model when the path changes; the next call reloads it."""
+    global MODEL_PATH, vosk_model
+    path = stt.get("model_path") if stt is not None else None
+    if path and path != MODEL_PATH:
+        MODEL_PATH, vosk_model = path, None
+
+
+config_service.subscribe("stt", _on_stt_config)
 
 
 def transcribe_audio(audio_bytes: bytes) -> str:
@@ -17,7 +35,7 @@ def transcribe_audio(audio_bytes: bytes) -> str:
     Use this for batch-style transcription of recorded audio.
     Input must already be 16kHz mono PCM.
     """
-    recognizer = vosk.KaldiRecognizer(vosk_model, TARGET_RATE)
+    recognizer = vosk.KaldiRecognizer(_get_model(), TARGET_RATE)
 
     if recognizer.AcceptWaveform(audio_bytes):
         result = json.loads(recognizer.Result())
@@ -0,0 +1,214 @@
+# halo/ui/messages.py
+"""
+Structured chat history for ChatPanel (no Qt imports).
+
+Each message keeps its text as a list of streamed chunks and detects fenced
+code blocks incrementally as tokens arrive, so "copy last code" and
+per-block copy never re-scan message text. Old messages are spilled to a
+JSONL file to bound memory in long sessions.
+"""
+
+import json
+import os
+import time
+
+FENCE = "```"
+MAX_IN_MEMORY = 200      # messages kept in memory before spilling to disk
+SPILL_DIR = os.path.join("data", "logs")
+
+
+class CodeBlock:
+    """A closed ``` fenced block found in a message."""
+
+    def __init__(self, lang, code, message):
+        self.lang = lang
+        self.code = code
+        self.message = message
+
+    def __repr__(self):
+        return f"CodeBlock(lang={self.lang!r}, {len(self.code)} chars)"
+
+
+class Message:
+    """One chat line: role, streamed text buffer, timestamps, code blocks."""
+
+    def __init__(self, role, text=""):
+        self.role = role
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.code_blocks = []
+        self._chunks = []
+        self._text = None          # cached "".join(self._chunks)
+        self._pending = ""         # unscanned tail (may hold a split fence)
+        self._in_code = False
+        self._code_parts = []
+        if text:
+            self.append(text)
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = "".join(self._chunks)
+        return self._text
+
+    def line(self):
+        return f"{self.role}: {self.text}"
+
+    def append(self, token):
+        """
+        Add a streamed chunk and return any code blocks it closed.
+        Only the new token (plus at most two held-back characters) is scanned.
+        """
+        self._chunks.append(token)
+        self._text = None
+        self.updated_at = time.time()
+
+        closed = []
+        self._pending += token
+        while True:
+            idx = self._pending.find(FENCE)
+            if idx == -1:
+                # Hold back up to two chars in case a fence is split across tokens
+                cut = max(len(self._pending) - (len(FENCE) - 1), 0)
+                self._consume(self._pending[:cut])
+                self._pending = self._pending[cut:]
+                break
+            self._consume(self._pending[:idx])
+            self._pending = self._pending[idx + len(FENCE):]
+            if self._in_code:
+                closed.append(self._close_block())
+            else:
+                self._in_code = True
+                self._code_parts = []
+        return closed
+
+    def reset(self):
+        """Clear the text and code blocks, keeping role and creation time."""
+        self.code_blocks = []
+        self._chunks = []
+        self._text = None
+        self._pending = ""
+        self._in_code = False
+        self._code_parts = []
+        self.updated_at = time.time()
+
+    def _consume(self, text):
+        if self._in_code and text:
+            self._code_parts.append(text)
+
+    def _close_block(self):
+        body = "".join(self._code_parts)
+        self._in_code = False
+        self._code_parts = []
+
+        # First line of a fence is the language tag ("```python"), if any
+        lang = ""
+        first, sep, rest = body.partition("\n")
+        if sep and first.strip() and " " not in first.strip():
+            lang, body = first.strip(), rest
+        block = CodeBlock(lang, body.strip(), self)
+        self.code_blocks.append(block)
+        return block
+
+    def to_dict(self):
+        return {
+            "role": self.role,
+            "text": self.text,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "code_blocks": [{"lang": b.lang, "code": b.code} for b in self.code_blocks],
+        }
+
+
+class MessageStore:
+    """
+    Ordered chat history with a running index of code blocks.
+
+    - `last_code_block()` / `code_block(i)` are O(1).
+    - Beyond `max_in_memory` messages, the oldest are appended to a JSONL
+      file under `spill_dir` and dropped from memory (with their blocks).
+    """
+
+    def __init__(self, max_in_memory=MAX_IN_MEMORY, spill_dir=SPILL_DIR):
+        self.max_in_memory = max_in_memory
+        self.spill_dir = spill_dir
+        self.spill_path = None
+        self.spilled = 0
+        self._messages = []
+        self._blocks = []
+
+    def __len__(self):
+        return len(self._messages)
+
+    def __iter__(self):
+        return iter(self._messages)
+
+    def __getitem__(self, index):
+        return self._messages[index]
+
+    def add(self, role, text=""):
+        message = Message(role)
+        self._messages.append(message)
+        if text:
+            self.append_to(message, text)
+        self._spill_if_needed()
+        return message
+
+    def append_to(self, message, token):
+        """
+        Stream a token into `message`, indexing any code blocks it closes.
+        Returns those blocks.
+        """
+        closed = message.append(token)
+        self._blocks.extend(closed)
+        return closed
+
+    def reset_message(self, message, text=""):
+        """Replace a message's text, dropping the code blocks it had indexed."""
+        if message.code_blocks:
+            ids = {id(b) for b in message.code_blocks}
+            self._blocks = [b for b in self._blocks if id(b) not in ids]
+        message.reset()
+        if text:
+            self.append_to(message, text)
+
+    # ------------------ Code blocks ------------------
+
+    def last_code_block(self):
+        return self._blocks[-1] if self._blocks else None
+
+    def code_block(self, index):
+        """Block by position among those in memory (negative indexes allowed)."""
+        return self._blocks[index]
+
+    def code_block_count(self):
+        return len(self._blocks)
+
+    # ------------------ Context / display ------------------
+
+    def recent_lines(self, n):
+        return [m.line() for m in self._messages[-n:]]
+
+    def render(self):
+        return "\n".join(m.line() for m in self._messages)
+
+    # ------------------ Spilling ------------------
+
+    def _spill_if_needed(self):
+        overflow = len(self._messages) - self.max_in_memory
+        if overflow <= 0:
+            return
+        old, self._messages = self._messages[:overflow], self._messages[overflow:]
+
+        if self.spill_path is None:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            self.spill_path = os.path.join(self.spill_dir, f"chat-{stamp}.jsonl")
+        with open(self.spill_path, "a", encoding="utf-8") as f:
+            for message in old:
+                f.write(json.dumps(message.to_dict(), ensure_ascii=False) + "\n")
+
+        ids = {id(b) for m in old for b in m.code_blocks}
+        if ids:
+            self._blocks = [b for b in self._blocks if id(b) not in ids]
+        self.spilled += len(old)
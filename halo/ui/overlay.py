@@ -1,6 +1,5 @@
 import numpy as np
 import os
-import re
 from PyQt6 import QtCore
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QPushButton, QLabel, QTextEdit, QFrame,
@@ -8,11 +7,20 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal
 from PyQt6.QtGui import QIcon , QTextCursor , QClipboard
-from halo.core.llm import query_ollama
-from halo.core.pipeline import start_new_session, get_transcript_context, record_continuous
+from halo.core.llm import query_ollama, warm_up
+from halo.core.pipeline import (
+    start_new_session, get_transcript_context, record_continuous,
+    pause_recording, resume_recording, stop_recording, load_recognizer,
+    health_summary, set_profiling,
+)
 import threading
 from halo.core.pipeline import get_transcript_context, _save_to_file
-from halo.core.listener import stop_streaming
+from halo.core.listener import (
+    list_profiles, current_profile, set_profile,
+)
+from halo.ui.messages import MessageStore
+from halo.utils import profiling
+from halo.utils.config_loader import config, config_service
 import ctypes
 
 
@@ -23,10 +31,11 @@ class LLMWorker(QThread):
     def __init__(self, query_dict):
         super().__init__()
         self.prompt = query_dict["prompt"]
-        self.model = query_dict.get("model", "qwen2.5:3b")  # default fallback
+        self.model = query_dict.get("model") or config.llm.model  # default fallback
         self._stop_event = threading.Event()
 
     def run(self):
+        threading.current_thread().name = "llm-worker"  # label for profiler reports
         try:
             for token in query_ollama(self.prompt, model=self.model, stream=True):
                 if self._stop_event.is_set():
@@ -41,6 +50,29 @@ class LLMWorker(QThread):
         self._stop_event.set()
 
 
+class ModelLoader(QThread):
+    """
+    Runs a slow initializer (Vosk model load, Ollama warm-up) off the UI
+    thread so the overlay appears immediately.
+    `ready` carries (ok, message).
+    """
+    ready = pyqtSignal(bool, str)
+
+    def __init__(self, init_fn):
+        super().__init__()
+        self.init_fn = init_fn
+
+    def run(self):
+        try:
+            result = self.init_fn()
+            if isinstance(result, tuple):
+                self.ready.emit(bool(result[0]), str(result[1]))
+            else:
+                self.ready.emit(True, "")
+        except Exception as e:
+            self.ready.emit(False, str(e))
+
+
 # ----------------- Clickable QLabel -----------------
 class ClickableLabel(QLabel):
     clicked = QtCore.pyqtSignal()  # Custom signal
@@ -49,6 +81,9 @@ class ClickableLabel(QLabel):
 
 # ----------------- Chat Panel -----------------
 class ChatPanel(QWidget):
+    llm_model_changed = pyqtSignal(str)
+    audio_profiles_changed = pyqtSignal()
+
     def __init__(self):
         super().__init__()
         self.setWindowFlags(
@@ -79,7 +114,8 @@ class ChatPanel(QWidget):
 
         # Messages display
         # in your __init__:
-        self.messages = []           # Python list for history
+        self.messages = MessageStore()  # structured history + code-block index
+        self.current_reply = None
         # Inside ChatPanel.__init__(), replace the chat_box definition with:
         self.chat_box = QTextEdit()
         self.chat_box.setReadOnly(True)
@@ -135,6 +171,10 @@ class ChatPanel(QWidget):
 
         self.model_selector = QComboBox()
         self.model_selector.addItems(["gemma3:4b", "qwen2.5:3b", "phi3"])
+        self._select_model(config.llm.model)
+        # Config reloads happen on the watcher thread; hop to the UI thread
+        self.llm_model_changed.connect(self._select_model)
+        config_service.subscribe("llm", lambda llm: self.llm_model_changed.emit(llm.model))
         self.model_selector.setStyleSheet("""
             QComboBox {
                 background: rgba(255,255,255,30);
@@ -145,6 +185,18 @@ class ChatPanel(QWidget):
         """)
         layout.addWidget(self.model_selector)
 
+        # Latency/CPU profile (block size, recognizer feed rate, endpointing)
+        self.profile_selector = QComboBox()
+        self._reload_profiles()
+        self.profile_selector.setToolTip("Audio profile: low-latency / balanced / low-power")
+        self.profile_selector.setStyleSheet(self.model_selector.styleSheet())
+        self.profile_selector.currentTextChanged.connect(self._select_profile)
+        # Profiles can be renamed/removed and audio.profile switched in settings.yaml
+        self.audio_profiles_changed.connect(self._reload_profiles)
+        config_service.subscribe("profiles", lambda _: self.audio_profiles_changed.emit())
+        config_service.subscribe("audio", lambda _: self.audio_profiles_changed.emit())
+        layout.addWidget(self.profile_selector)
+
         # Send button
         self.send_btn = QPushButton("Send")
         self.send_btn.setStyleSheet("""
@@ -162,12 +214,44 @@ class ChatPanel(QWidget):
         self.copy_code_btn.clicked.connect(self.copy_last_code_block)
         layout.addWidget(self.copy_code_btn)
 
+        # Any earlier code block of the conversation, picked from a list
+        self.code_block_selector = QComboBox()
+        self.code_block_selector.setToolTip("Copy a code block from the conversation")
+        self.code_block_selector.setStyleSheet(self.model_selector.styleSheet())
+        self.code_block_selector.activated.connect(self._copy_selected_code_block)
+        self._refresh_code_blocks()
+        layout.addWidget(self.code_block_selector)
+
         send_icon = QIcon(os.path.join("halo", "ui", "assets", "send.svg"))
         self.send_btn.setIcon(send_icon)
         self.send_btn.setIconSize(QtCore.QSize(20,20))
         self.send_btn.clicked.connect(self.send_message)
+        self.send_btn.setText("Loading…")
+        self.send_btn.setEnabled(False)  # enabled once the LLM client is ready
         layout.addWidget(self.send_btn)
 
+        # Diagnostics: sampling profiler toggle + live health summary
+        diagnostics = QHBoxLayout()
+        self.profiling_btn = QPushButton("Start Profiling")
+        self.profiling_btn.setStyleSheet(self.copy_code_btn.styleSheet().replace("#4ade80", "#fbbf24"))
+        self.profiling_btn.setToolTip("Sample all threads; reports go to data/logs/profile-*")
+        self.profiling_btn.clicked.connect(self.toggle_profiling)
+        self._set_profiling_label()
+        diagnostics.addWidget(self.profiling_btn)
+        self.health_btn = QPushButton("Health")
+        self.health_btn.setStyleSheet(self.copy_code_btn.styleSheet().replace("#4ade80", "#93c5fd"))
+        self.health_btn.clicked.connect(self.toggle_health)
+        diagnostics.addWidget(self.health_btn)
+        layout.addLayout(diagnostics)
+
+        self.health_box = QTextEdit()
+        self.health_box.setReadOnly(True)
+        self.health_box.setStyleSheet(self.chat_box.styleSheet())
+        self.health_box.hide()
+        layout.addWidget(self.health_box, 1)
+        self.health_timer = QTimer()
+        self.health_timer.timeout.connect(self.refresh_health)
+
         # Resize handle
         size_grip = QSizeGrip(self)
         layout.addWidget(size_grip, 0, Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignRight)
@@ -199,6 +283,38 @@ class ChatPanel(QWidget):
             print(f"⚠️ Could not protect overlay: {e}")
 
 
+    def _select_model(self, model):
+        if self.model_selector.findText(model) == -1:
+            self.model_selector.addItem(model)
+        self.model_selector.setCurrentText(model)
+
+    def _reload_profiles(self):
+        """Rebuild the profile list from config and show the active one."""
+        self.profile_selector.blockSignals(True)
+        self.profile_selector.clear()
+        self.profile_selector.addItems(list_profiles())
+        self.profile_selector.setCurrentText(current_profile())
+        self.profile_selector.blockSignals(False)
+
+    def _select_profile(self, name):
+        # An exception escaping a Qt slot aborts the app, so never let one out
+        if not name or name == current_profile():
+            return
+        try:
+            set_profile(name)
+        except ValueError as e:
+            print(f"⚠️ Could not switch audio profile: {e}")
+            self._reload_profiles()
+
+    def set_llm_ready(self, ok, message):
+        """
+        Called when the background LLM warm-up finishes. Send is enabled
+        either way; if Ollama was unreachable the reply will carry the error.
+        """
+        self.send_btn.setText("Send")
+        self.send_btn.setEnabled(True)
+        self.send_btn.setToolTip("" if ok else f"LLM not ready: {message}")
+
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
             self.drag_position = event.globalPosition().toPoint() - self.frameGeometry().topLeft()
@@ -211,12 +327,12 @@ class ChatPanel(QWidget):
     # in your __init__:
     def send_message(self):
         user_text = self.input.toPlainText().strip()
-        if not user_text:
+        if not user_text or not self.send_btn.isEnabled():
             return
 
         # Include incremental transcript + chat messages for context
         transcript_context = get_transcript_context()  # all finalized speech
-        recent_messages = "\n".join(self.messages[-5:])  # recent chat lines
+        recent_messages = "\n".join(self.messages.recent_lines(5))  # recent chat lines
 
         # Combine incremental transcript + recent chat
         selected_model = self.model_selector.currentText()
@@ -226,11 +342,8 @@ class ChatPanel(QWidget):
         }
 
         # Add user message to chat panel
-        self.messages.append(f"User: {user_text}")
-        self.messages.append("Halo: ")  # placeholder
-
-        self.current_reply_index = len(self.messages) - 1
-        self.reply_text = ""
+        self.messages.add("User", user_text)
+        self.current_reply = self.messages.add("Halo")  # filled as tokens stream
 
         # Update UI immediately
         self.update_chat_display()
@@ -247,38 +360,91 @@ class ChatPanel(QWidget):
 
 
     def on_token_received(self, token):
-            self.reply_text += token
-            self.messages[self.current_reply_index] = f"Halo: {self.reply_text}"
-            self.update_chat_display()  # refresh QTextEdit
+            profiling.count("tokens_rendered")
+            if self.messages.append_to(self.current_reply, token):
+                self._refresh_code_blocks()  # the token closed a code block
+            # The reply is the last line on screen: append instead of re-rendering
+            cursor = self.chat_box.textCursor()
+            cursor.movePosition(QTextCursor.MoveOperation.End)
+            cursor.insertText(token)
+            self.chat_box.setTextCursor(cursor)
 
     def on_reply_finished(self):
             print("✅ Reply finished streaming.")
 
     def update_chat_display(self):
-        # Display messages from the Python list in the QTextEdit
-        self.chat_box.setPlainText("\n".join(self.messages))
+        # Display messages from the store in the QTextEdit
+        self.chat_box.setPlainText(self.messages.render())
 
         # Move cursor to the end so new text is always visible
         cursor = self.chat_box.textCursor()
         cursor.movePosition(QTextCursor.MoveOperation.End)
         self.chat_box.setTextCursor(cursor)
+        self._refresh_code_blocks()
+
+    def _refresh_code_blocks(self):
+        """List the code blocks in memory, newest first, under a placeholder item."""
+        self.code_block_selector.clear()
+        count = self.messages.code_block_count()
+        self.code_block_selector.addItem(f"Copy code block… ({count})" if count else "No code blocks")
+        for index in range(count - 1, -1, -1):
+            block = self.messages.code_block(index)
+            first = block.code.splitlines()[0][:40] if block.code else ""
+            self.code_block_selector.addItem(f"#{index + 1} {block.lang or 'code'}: {first}", index)
+        self.code_block_selector.setEnabled(count > 0)
+
+    def _copy_selected_code_block(self, row):
+        index = self.code_block_selector.itemData(row)
+        self.code_block_selector.setCurrentIndex(0)  # back to the placeholder
+        if index is not None:
+            self.copy_code_block(index)
 
     def copy_last_code_block(self):
         """
-        Search the last code block in self.reply_text (or messages) and copy it to clipboard.
+        Copy the most recent code block to the clipboard.
+        Blocks are indexed as tokens stream in, so this is a lookup, not a scan.
         """
-        # Search messages in reverse for a code block
-        for msg in reversed(self.messages):
-            code_match = re.search(r"```(.*?)```", msg, re.DOTALL)
-            if code_match:
-                code_text = code_match.group(1).strip()
-                clipboard = QApplication.clipboard()
-                clipboard.setText(code_text)
-                print("✅ Code copied to clipboard")
-                return
+        block = self.messages.last_code_block()
+        if block is None:
+            print("⚠️ No code block found to copy")
+            return
+        QApplication.clipboard().setText(block.code)
+        print("✅ Code copied to clipboard")
 
-        print("⚠️ No code block found to copy")
+    def copy_code_block(self, index):
+        """Copy a specific code block (0 = oldest in memory, -1 = newest)."""
+        try:
+            block = self.messages.code_block(index)
+        except IndexError:
+            print(f"⚠️ No code block #{index}")
+            return
+        QApplication.clipboard().setText(block.code)
+        print("✅ Code copied to clipboard")
+
+
+    # ----------------- Diagnostics -----------------
+    def _set_profiling_label(self):
+        self.profiling_btn.setText("Stop Profiling" if profiling.is_profiling() else "Start Profiling")
+
+    def toggle_profiling(self):
+        set_profiling(not profiling.is_profiling())
+        self._set_profiling_label()
+
+    def toggle_health(self):
+        """Swap the chat view for a health summary refreshed every second."""
+        showing = self.health_box.isHidden()
+        self.health_box.setVisible(showing)
+        self.chat_box.setVisible(not showing)
+        self.health_btn.setText("Chat" if showing else "Health")
+        if showing:
+            self.refresh_health()
+            self.health_timer.start(1000)
+        else:
+            self.health_timer.stop()
 
+    def refresh_health(self):
+        self._set_profiling_label()
+        self.health_box.setPlainText(health_summary())
 
     def use_suggestion(self):
         text = self.suggestion_label.text()
@@ -292,20 +458,16 @@ class ChatPanel(QWidget):
             self.worker.wait()  # ensures thread fully stops
 
         # Replace partial AI reply with [Stopped] message
-        if hasattr(self, "current_reply_index"):
-            self.messages[self.current_reply_index] = "Halo: [Stopped]"
-            self.reply_text = ""
+        if self.current_reply is not None:
+            self.messages.reset_message(self.current_reply, "[Stopped]")
             self.update_chat_display()
 
-        # Remove unfinished AI placeholder at the end, so next query is fresh
-        if len(self.messages) > 0 and self.messages[-1] == "Halo: ":
-            self.messages.pop()
-
 
 
 # ----------------- Floating Overlay -----------------
 class FloatingOverlay(QWidget):
     update_transcript_signal = pyqtSignal(str)
+    stt_config_changed = pyqtSignal()
     def __init__(self):
         super().__init__()
 
@@ -348,7 +510,7 @@ class FloatingOverlay(QWidget):
         # Status dot
         self.status_dot = QLabel()
         self.status_dot.setFixedSize(12, 12)
-        self.status_dot.setStyleSheet("background-color: #10b981; border-radius: 6px;")
+        self.status_dot.setStyleSheet("background-color: #f59e0b; border-radius: 6px;")  # loading
         layout.addWidget(self.status_dot)
 
         # Icon paths
@@ -365,6 +527,8 @@ class FloatingOverlay(QWidget):
         self.listen_btn.setIcon(QIcon(icon_paths['mic']))
         self.listen_btn.setIconSize(QtCore.QSize(20, 20))
         self.listen_btn.clicked.connect(self.toggle_listening_state)
+        self.listen_btn.setText("Loading…")
+        self.listen_btn.setEnabled(False)  # enabled once the Vosk model is loaded
         layout.addWidget(self.listen_btn)
 
         # Stop button
@@ -426,6 +590,55 @@ class FloatingOverlay(QWidget):
         self.transcript_btn.setFixedHeight(30)
         self.transcript_btn.clicked.connect(self.toggle_transcript_panel)
         layout.addWidget(self.transcript_btn)
+
+        # ----------------- Background initialization -----------------
+        self.stt_ready = False
+        self._stt_retry = False
+        self._start_stt_loader()
+        # A fixed stt.model_path (or stt.process) in settings.yaml retries a failed load
+        self.stt_config_changed.connect(self._on_stt_config_changed)
+        config_service.subscribe("stt", lambda _: self.stt_config_changed.emit())
+
+        self.llm_loader = ModelLoader(warm_up)
+        self.llm_loader.ready.connect(self.chat_panel.set_llm_ready)
+        self.llm_loader.start()
+
+    def _start_stt_loader(self):
+        self.listen_btn.setText("Loading…")
+        self.listen_btn.setEnabled(False)
+        self.status_dot.setStyleSheet("background-color: #f59e0b; border-radius: 6px;")
+        self.stt_loader = ModelLoader(load_recognizer)
+        self.stt_loader.ready.connect(self._on_stt_ready)
+        self.stt_loader.start()
+
+    def _on_stt_config_changed(self):
+        if self.stt_ready:
+            return  # a loaded model is swapped by the listener itself
+        if self.stt_loader.isRunning():
+            self._stt_retry = True  # the load in flight may use the old path
+        else:
+            self._start_stt_loader()
+
+    def _on_stt_ready(self, ok, message):
+        if self._stt_retry:
+            # stt changed mid-load: load again with the current settings
+            # (returns at once if the model already matches them)
+            self._stt_retry = False
+            self._start_stt_loader()
+            return
+        self._stt_retry = False
+        self.stt_ready = ok
+        if ok:
+            self.listen_btn.setToolTip("")
+            self.listen_btn.setText("Listen")
+            self.listen_btn.setEnabled(True)
+            self.status_dot.setStyleSheet("background-color: #10b981; border-radius: 6px;")
+        else:
+            # Without a speech model there is nothing to listen with
+            self.listen_btn.setText("STT unavailable")
+            self.listen_btn.setToolTip(message)
+            self.status_dot.setStyleSheet("background-color: #ef4444; border-radius: 6px;")
+            print(f"⚠️ Could not load Vosk model: {message}")
         
 
     def stop_llama(self):
@@ -458,6 +671,7 @@ class FloatingOverlay(QWidget):
 
     def _update_transcript_ui(self, text):
     # Send transcript to the new panel, not chat_panel
+        profiling.count("transcript_renders")
         self.transcript_panel.setPlainText(text)
         self.transcript_panel.verticalScrollBar().setValue(
             self.transcript_panel.verticalScrollBar().maximum()
@@ -475,13 +689,9 @@ class FloatingOverlay(QWidget):
         for result in record_continuous():
             if self._stop_event.is_set():
                 # ensure the mic stream is shut down inside the generator too
-                stop_streaming()
+                stop_recording()
                 break
 
-            if self.is_paused:
-                QtCore.QThread.msleep(100)
-                continue
-
             # Backward compatibility if anything yields plain strings
             if not isinstance(result, dict):
                 text = str(result).strip()
@@ -499,7 +709,9 @@ class FloatingOverlay(QWidget):
             if result.get("type") == "partial":
                 # Show current saved finals + a live partial preview line
                 finals = get_transcript_context()  # contains only finalized text
-                live_view = (finals + ("\n" if finals else "") + f"[…] {text}").strip()
+                source = result.get("source")
+                label = f"[…] {source}: " if source and source != "mix" else "[…] "
+                live_view = (finals + ("\n" if finals else "") + f"{label}{text}").strip()
                 self.update_transcript_signal.emit(live_view)
             else:
                 # Final result: pipeline already saved it; re-render from cache
@@ -547,8 +759,10 @@ class FloatingOverlay(QWidget):
             self.is_paused = not self.is_paused
             self.listen_btn.setText("Resume" if self.is_paused else "Pause")
             if self.is_paused:
+                pause_recording()  # stops mic + decoder, flushes the utterance
                 self.blink_timer.stop()
             else:
+                resume_recording()
                 self.blink_timer.start(500)
 
     def stop_all(self):
@@ -562,6 +776,7 @@ class FloatingOverlay(QWidget):
             self.status_dot.setStyleSheet("background-color: #10b981; border-radius: 6px;")
             if hasattr(self, "_stop_event"):
                 self._stop_event.set()
+            stop_recording()  # unblocks the listen loop even if paused or silent
             if hasattr(self, "recording_thread") and self.recording_thread.is_alive():
                 self.recording_thread.join()
 
@@ -605,7 +820,7 @@ class FloatingOverlay(QWidget):
 
     def append_transcript(self, text):
         if not self.is_paused:
-            self.chat_panel.messages.append(f"Transcript: {text}")
+            self.chat_panel.messages.add("Transcript", text)
 
 # # ----------------- Run App -----------------
 # if __name__ == "__main__":
@@ -0,0 +1,267 @@
+# halo/ui/socket_server.py
+"""
+Local streaming transcript server for headless mode (no Qt imports).
+
+Protocol: newline-delimited JSON over TCP (localhost) or a Unix socket.
+
+Server -> client:
+    {"type": "partial", "text": "hel", "source": "mix"}
+    {"type": "final", "text": "hello world", "source": "mix"}
+    {"type": "token", "id": "q1", "text": "Hi"}        (LLM reply chunk)
+    {"type": "reply_end", "id": "q1"}
+    {"type": "stats", "stats": {...}}                  (pipeline queue depths, counters)
+    {"type": "health", "text": "..."}                  (one-screen summary)
+
+Client -> server:
+    {"type": "query", "id": "q1", "prompt": "...", "model": "qwen2.5:3b"}
+    {"type": "stats"}
+    {"type": "health"}
+"""
+
+import json
+import os
+import queue
+import socket
+import stat
+import threading
+
+from halo.core.pipeline import (
+    start_new_session, record_continuous, get_transcript_context,
+    bus, pipeline_stats, stop_recording, health_summary,
+)
+
+# ===== CONFIG =====
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+CLIENT_QUEUE_SIZE = 256   # events buffered per client before backpressure
+OUTBOX_SIZE = 1024        # events buffered in the server's bus stage
+TOKEN_PUT_TIMEOUT = 5.0   # seconds an LLM stream waits on a full client
+
+
+def _remove_stale_socket(path):
+    """
+    Delete a Unix socket left behind by a server that is gone. Anything
+    else at `path` (a regular file, a live server's socket) is an error.
+    """
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise OSError(f"{path} exists and is not a socket; not replacing it")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.remove(path)  # nobody listening: stale
+        return
+    finally:
+        probe.close()
+    raise OSError(f"Another server is already listening on {path}")
+
+
+def _encode(event: dict) -> bytes:
+    return (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+class _Client:
+    """One connected subscriber with its own bounded queue and writer thread."""
+
+    def __init__(self, conn, addr, on_close):
+        self.conn = conn
+        self.addr = addr
+        self.events = queue.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        self.dropped = 0
+        self.closed = threading.Event()
+        self._on_close = on_close
+
+        threading.Thread(target=self._writer, daemon=True).start()
+        threading.Thread(target=self._reader, daemon=True).start()
+
+    def offer(self, event: dict):
+        """
+        Non-blocking enqueue used by the fan-out thread.
+        - Partials are dropped when the client is behind (the next one
+          supersedes it anyway).
+        - A final that does not fit means the client is too slow to keep a
+          consistent transcript, so it is disconnected.
+        """
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            if event.get("type") == "partial":
+                self.dropped += 1
+            else:
+                print(f"[Server] Client {self.addr} too slow, disconnecting")
+                self.close()
+
+    def send_blocking(self, event: dict) -> bool:
+        """Enqueue an LLM event for this client only, waiting if it is behind."""
+        try:
+            self.events.put(event, timeout=TOKEN_PUT_TIMEOUT)
+            return True
+        except queue.Full:
+            self.close()
+            return False
+
+    def _writer(self):
+        try:
+            while not self.closed.is_set():
+                try:
+                    event = self.events.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                self.conn.sendall(_encode(event))
+        except OSError:
+            pass
+        finally:
+            self.close()
+
+    def _reader(self):
+        try:
+            with self.conn.makefile("r", encoding="utf-8") as lines:
+                for line in lines:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        request = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if request.get("type") == "query" and request.get("prompt"):
+                        threading.Thread(
+                            target=self._answer, args=(request,), daemon=True
+                        ).start()
+                    elif request.get("type") == "stats":
+                        self.send_blocking({"type": "stats", "stats": pipeline_stats()})
+                    elif request.get("type") == "health":
+                        self.send_blocking({"type": "health", "text": health_summary()})
+        except (OSError, ValueError):
+            pass
+        finally:
+            self.close()
+
+    def _answer(self, request: dict):
+        """Stream an LLM reply for this client, with the transcript as context."""
+        from halo.core.llm import query_ollama  # only needed once someone asks
+
+        query_id = request.get("id")
+        prompt = f"{get_transcript_context()}\nUser: {request['prompt']}"
+        for token in query_ollama(prompt, stream=True, model=request.get("model")):
+            if self.closed.is_set() or not self.send_blocking(
+                {"type": "token", "id": query_id, "text": token}
+            ):
+                return
+        self.send_blocking({"type": "reply_end", "id": query_id})
+
+    def close(self):
+        if self.closed.is_set():
+            return
+        self.closed.set()
+        try:
+            self.conn.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.conn.close()
+        self._on_close(self)
+
+
+class TranscriptServer:
+    """
+    Fans transcript events out to any number of local clients.
+
+    It runs as one stage on the pipeline's event bus (see serve_transcripts),
+    so recognition pays the same cost no matter how many clients connect.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None):
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self._clients = set()
+        self._lock = threading.Lock()
+        self._sock = None
+        self._running = threading.Event()
+
+    # ------------------ Lifecycle ------------------
+
+    def start(self):
+        if self.unix_path:
+            if not hasattr(socket, "AF_UNIX"):
+                raise OSError("Unix sockets are not supported on this platform")
+            _remove_stale_socket(self.unix_path)
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.bind(self.unix_path)
+            where = self.unix_path
+        else:
+            self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._sock.bind((self.host, self.port))
+            where = f"{self.host}:{self.port}"
+        self._sock.listen()
+        self._running.set()
+
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        print(f"[Server] Streaming transcripts on {where}")
+
+    def close(self):
+        self._running.clear()
+        if self._sock is not None:
+            self._sock.close()
+        with self._lock:
+            clients = list(self._clients)
+        for client in clients:
+            client.close()
+        if self.unix_path and os.path.exists(self.unix_path):
+            os.remove(self.unix_path)
+
+    # ------------------ Events ------------------
+
+    def publish(self, event: dict):
+        """Offer an event to every client; each client queue is non-blocking."""
+        with self._lock:
+            clients = list(self._clients)
+        for client in clients:
+            client.offer(event)
+
+    def handle(self, topic, event):
+        """Bus stage handler."""
+        self.publish(event)
+
+    def _accept_loop(self):
+        while self._running.is_set():
+            try:
+                conn, addr = self._sock.accept()
+            except OSError:
+                break
+            client = _Client(conn, addr or self.unix_path, self._remove)
+            with self._lock:
+                self._clients.add(client)
+            print(f"[Server] Client connected: {client.addr}")
+
+    def _remove(self, client):
+        with self._lock:
+            self._clients.discard(client)
+
+
+# ------------------ Headless entry point ------------------
+
+def serve_transcripts(host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None):
+    """
+    Run continuous recognition without any UI, publishing every event to
+    connected clients and printing finals to stdout. Blocks until Ctrl+C.
+    """
+    server = TranscriptServer(host=host, port=port, unix_path=unix_path)
+    server.start()
+    stage = bus.subscribe("socket", server.handle, ["partial", "transcript"], maxsize=OUTBOX_SIZE)
+    start_new_session()
+    try:
+        for result in record_continuous():
+            if result["type"] == "final":
+                print(result["text"], flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_recording()
+        bus.unsubscribe(stage)
+        server.close()
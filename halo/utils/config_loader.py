@@ -1,22 +1,38 @@
 # halo/utils/config_loader.py
 import yaml
 import os
+import threading
 
-DEFAULT_CONFIG_PATH = os.path.join("configs", "settings.yaml")
+# Resolve against the repo root so the app works from any working directory
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_CONFIG_PATH = os.path.join(PROJECT_ROOT, "configs", "settings.yaml")
 
 class Config:
     """Wrapper to allow attribute-style access to config dict."""
 
     def __init__(self, config_dict):
+        self._set(config_dict)
+
+    def _set(self, config_dict):
         self._dict = config_dict
         for key, value in config_dict.items():
             if isinstance(value, dict):
                 value = Config(value)
             setattr(self, key, value)
 
+    def _replace(self, config_dict):
+        """Swap contents in place so modules holding `config` see new values."""
+        for key in list(self._dict):
+            if key not in config_dict:
+                delattr(self, key)
+        self._set(config_dict)
+
     def __getitem__(self, key):
         return self._dict[key]
 
+    def get(self, key, default=None):
+        return self._dict.get(key, default)
+
     def __repr__(self):
         return str(self._dict)
 
@@ -26,5 +42,156 @@ def load_config(config_path: str = DEFAULT_CONFIG_PATH) -> Config:
         cfg_dict = yaml.safe_load(f)
     return Config(cfg_dict)
 
-# Global config instance
-config = load_config()
+
+def validate_config(cfg_dict, previous=None) -> list:
+    """
+    Check the settings that can be applied live. Returns a list of problems
+    (empty if the config is usable). The model path is only checked on disk
+    when it differs from `previous`.
+    """
+    errors = []
+    if not isinstance(cfg_dict, dict):
+        return ["settings file is empty or not a mapping"]
+
+    llm = cfg_dict.get("llm") or {}
+    if not isinstance(llm.get("model"), str) or not llm.get("model").strip():
+        errors.append("llm.model must be a non-empty string")
+
+    stt = cfg_dict.get("stt") or {}
+    model_path = stt.get("model_path")
+    old_path = ((previous or {}).get("stt") or {}).get("model_path")
+    if not isinstance(model_path, str):
+        errors.append(f"stt.model_path must be a string: {model_path!r}")
+    elif model_path != old_path and not os.path.isdir(model_path):
+        errors.append(f"stt.model_path is not a directory: {model_path!r}")
+    if not isinstance(stt.get("process", False), bool):
+        errors.append("stt.process must be true or false")
+
+    audio = cfg_dict.get("audio") or {}
+    block_size = audio.get("block_size", 8192)
+    if not isinstance(block_size, int) or block_size <= 0:
+        errors.append(f"audio.block_size must be a positive integer: {block_size!r}")
+    if not isinstance(audio.get("native_format", True), bool):
+        errors.append("audio.native_format must be true or false")
+
+    names = set()
+    for source in audio.get("sources") or []:
+        if not isinstance(source, dict) or not source.get("name"):
+            errors.append("audio.sources entries need a name")
+            continue
+        if source["name"] in names:
+            errors.append(f"audio.sources has a duplicate name: {source['name']!r}")
+        names.add(source["name"])
+        channels = source.get("channels")
+        if channels is not None and (not isinstance(channels, list) or not channels
+                                     or not all(isinstance(c, int) and c >= 0 for c in channels)):
+            errors.append(f"audio.sources.{source['name']}.channels must be a list of channel indexes")
+
+    profiles = cfg_dict.get("profiles") or {}
+    profile = audio.get("profile", "balanced")
+    if profile not in profiles and profile != "balanced":  # balanced has built-in defaults
+        errors.append(f"audio.profile {profile!r} is not defined under profiles")
+    for name, settings in profiles.items():
+        settings = settings or {}
+        if not isinstance(settings.get("block_size", 8192), int) or settings.get("block_size", 8192) <= 0:
+            errors.append(f"profiles.{name}.block_size must be a positive integer")
+        if not isinstance(settings.get("feed_ms", 0), (int, float)) or settings.get("feed_ms", 0) < 0:
+            errors.append(f"profiles.{name}.feed_ms must be >= 0")
+        if settings.get("endpointer_mode", "default") not in ("default", "short", "long", "very_long"):
+            errors.append(f"profiles.{name}.endpointer_mode must be default, short, long or very_long")
+    return errors
+
+
+class ConfigService:
+    """
+    Owns the global `config` and keeps it in sync with the settings file.
+
+    - `subscribe(section, callback)`: callback(new_section) runs on the
+      watcher thread whenever that top-level section changes.
+    - `start_watching()`: polls the file's mtime; a change that fails
+      validation is reported and ignored, keeping the current settings.
+    """
+
+    def __init__(self, config_path: str = DEFAULT_CONFIG_PATH):
+        self.config_path = config_path
+        self.config = load_config(config_path)
+        self._mtime = self._current_mtime()
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+
+    def _current_mtime(self):
+        try:
+            return os.path.getmtime(self.config_path)
+        except OSError:
+            return None
+
+    def subscribe(self, section: str, callback):
+        with self._lock:
+            self._subscribers.setdefault(section, []).append(callback)
+
+    def reload(self) -> bool:
+        """Re-read the file and apply it. Returns True if anything changed."""
+        try:
+            with open(self.config_path, "r", encoding="utf-8") as f:
+                new_dict = yaml.safe_load(f)
+        except (OSError, yaml.YAMLError) as e:
+            print(f"[Config] Could not read {self.config_path}: {e}")
+            return False
+
+        errors = validate_config(new_dict, previous=self.config._dict)
+        if errors:
+            print("[Config] Ignoring invalid settings: " + "; ".join(errors))
+            return False
+
+        old_dict = self.config._dict
+        changed = [k for k in set(old_dict) | set(new_dict) if old_dict.get(k) != new_dict.get(k)]
+        if not changed:
+            return False
+
+        self.config._replace(new_dict)
+        print(f"[Config] Reloaded sections: {', '.join(sorted(changed))}")
+
+        with self._lock:
+            callbacks = [(k, cb) for k in changed for cb in self._subscribers.get(k, [])]
+        for section, callback in callbacks:
+            try:
+                callback(getattr(self.config, section, None))
+            except Exception as e:
+                print(f"[Config] Failed to apply '{section}': {e}")
+        return True
+
+    def revert(self, section: str, key: str, value):
+        """
+        Put back a value a subscriber could not apply, so `config` shows what
+        is actually in effect. The file is left alone; the next edit to it
+        is applied again as usual.
+        """
+        target = getattr(self.config, section, None)
+        if target is None:
+            return
+        target._dict[key] = value
+        setattr(target, key, value)
+
+    def start_watching(self, interval: float = 1.0):
+        if self._watcher is not None:
+            return
+        self._watcher = threading.Thread(target=self._watch, args=(interval,),
+                                         name="config-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        self._stop.set()
+
+    def _watch(self, interval):
+        while not self._stop.wait(interval):
+            mtime = self._current_mtime()
+            if mtime is not None and mtime != self._mtime:
+                self._mtime = mtime
+                self.reload()
+
+
+# Global config service and instance
+config_service = ConfigService()
+config = config_service.config
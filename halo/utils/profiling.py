@@ -0,0 +1,270 @@
+# halo/utils/profiling.py
+"""
+Live-session diagnostics: always-on counters and an on-demand profiler.
+
+Counters are plain integers bumped from the hot paths (blocks processed,
+partials emitted, tokens rendered, bytes written, ...); `count()` is a dict
+update, cheap enough to leave on all the time.
+
+The profiler is a sampler: while running, a background thread reads every
+thread's current stack (sys._current_frames) every few milliseconds. The
+hot paths need no instrumentation and Python versions that allow only one
+active cProfile per process are fine. `stop_profiling()` writes one report
+per thread (recognizer-*, recognize, stage-*, llm-worker, MainThread = UI)
+to <log_dir>/profile-<stamp>/:
+
+    summary.txt       threads by busy samples, with CPU seconds where available
+    <thread>.txt      top functions by own and cumulative samples
+    <thread>.folded   collapsed stacks ("a;b;c <count>") for flame graph tools
+
+Start it from the overlay, with `HALO_PROFILE=1` in the environment (runs
+for the whole session, reports on exit), or `start_profiling()`.
+"""
+
+import atexit
+import datetime
+import os
+import sys
+import threading
+import time
+
+DEFAULT_INTERVAL_MS = 10
+MAX_DEPTH = 64           # frames kept per sample
+TOP_FUNCTIONS = 40       # rows per table in a thread report
+
+# A sample whose innermost Python frame is in one of these modules is a
+# thread parked on a lock, queue, selector or pipe: counted, but as idle
+IDLE_MODULES = {"threading.py", "queue.py", "selectors.py", "connection.py"}
+
+_started_at = time.monotonic()
+_cpu_started_at = time.process_time()
+_counters = {}
+_profiler = None
+
+
+# ------------------ Counters ------------------
+
+def count(name: str, n: int = 1):
+    """Add `n` to a named counter (a lost update under a race is acceptable)."""
+    _counters[name] = _counters.get(name, 0) + n
+
+
+def counters() -> dict:
+    return dict(_counters)
+
+
+def _merge(*counter_dicts) -> dict:
+    merged = {}
+    for counts in counter_dicts:
+        for name, value in (counts or {}).items():
+            merged[name] = merged.get(name, 0) + value
+    return merged
+
+
+def health_summary(stats=None, extra_counters=None) -> str:
+    """
+    One screen of text: uptime, CPU, counters with rates, and (given
+    pipeline_stats()) stage queues and per-source drops.
+    """
+    uptime = max(time.monotonic() - _started_at, 1e-9)
+    cpu = 100 * (time.process_time() - _cpu_started_at) / uptime
+    lines = [f"Uptime {uptime:,.0f} s   CPU {cpu:.1f}% of one core   "
+             f"Profiler {'ON' if is_profiling() else 'off'}", ""]
+
+    counts = _merge(_counters, extra_counters)
+    if counts:
+        lines.append(f"{'counter':<22}{'total':>14}{'per s':>10}")
+        for name in sorted(counts):
+            lines.append(f"{name:<22}{counts[name]:>14,}{counts[name] / uptime:>10.1f}")
+        lines.append("")
+
+    stats = stats or {}
+    stages = (stats.get("stages") or {})
+    if stages:
+        lines.append(f"{'stage':<14}{'depth':>8}{'max':>6}{'dropped':>9}{'busy %':>8}")
+        for name, s in stages.items():
+            lines.append(f"{name:<14}{s['depth']:>8}{s['max_depth']:>6}"
+                         f"{s['dropped']:>9}{s['busy_pct']:>8.1f}")
+        lines.append("")
+
+    sources = stats.get("sources") or {}
+    if sources:
+        lines.append(f"{'source':<14}{'path':>10}{'depth':>7}{'blocks':>9}{'dropped':>9}")
+        for name, s in sources.items():
+            lines.append(f"{name:<14}{str(s.get('capture_path')):>10}{s['depth']:>7}"
+                         f"{s['blocks_in']:>9}{s['blocks_dropped']:>9}")
+        lines.append("")
+
+    process = stats.get("process")
+    if process:
+        ring = process.get("ring") or {}
+        lines.append(f"Recognizer process pid {process.get('pid')}  restarts {process.get('restarts')}  "
+                     f"ring {ring.get('used', 0):,}/{ring.get('capacity', 0):,} B  "
+                     f"dropped {ring.get('dropped', 0)}")
+    return "\n".join(lines).rstrip() + "\n"
+
+
+# ------------------ Sampling profiler ------------------
+
+def _thread_names() -> dict:
+    return {t.ident: t.name for t in threading.enumerate()}
+
+
+def _cpu_clock(ident):
+    """Per-thread CPU clock id where the platform has one (Linux/macOS)."""
+    try:
+        return time.pthread_getcpuclockid(ident)
+    except (AttributeError, OSError, OverflowError):
+        return None
+
+
+class _ThreadProfile:
+    def __init__(self, name, ident):
+        self.name = name
+        self.samples = 0
+        self.idle = 0
+        self.own = {}
+        self.cumulative = {}
+        self.stacks = {}
+        self.clock = _cpu_clock(ident)
+        self.cpu_start = self._cpu()
+
+    def _cpu(self):
+        if self.clock is None:
+            return None
+        try:
+            return time.clock_gettime(self.clock)
+        except OSError:
+            return None  # thread has exited
+
+    def add(self, frame):
+        self.samples += 1
+        if os.path.basename(frame.f_code.co_filename) in IDLE_MODULES:
+            self.idle += 1
+            return
+        stack = []
+        while frame is not None and len(stack) < MAX_DEPTH:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        self.own[stack[0]] = self.own.get(stack[0], 0) + 1
+        for func in set(stack):
+            self.cumulative[func] = self.cumulative.get(func, 0) + 1
+        folded = ";".join(reversed(stack))
+        self.stacks[folded] = self.stacks.get(folded, 0) + 1
+
+    def cpu_seconds(self):
+        now = self._cpu()
+        if now is None or self.cpu_start is None:
+            return None
+        return now - self.cpu_start
+
+
+class SamplingProfiler:
+    """Samples every thread's stack on its own thread until stopped."""
+
+    def __init__(self, interval_ms=DEFAULT_INTERVAL_MS, label=None):
+        self.interval = interval_ms / 1000
+        self.label = label
+        self.threads = {}   # ident → _ThreadProfile
+        self.started = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self):
+        self.started = datetime.datetime.now()
+        self._thread.start()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = None
+            frames = sys._current_frames()
+            for ident, frame in frames.items():
+                if ident == own:
+                    continue
+                profile = self.threads.get(ident)
+                if profile is None:
+                    names = names or _thread_names()
+                    profile = self.threads[ident] = _ThreadProfile(
+                        names.get(ident, f"thread-{ident}"), ident)
+                profile.add(frame)
+            frames = frame = None  # don't keep other threads' frames alive between samples
+
+    def stop(self, log_dir) -> str:
+        """Stop sampling and write the reports; returns the report directory."""
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+        cpu = {ident: p.cpu_seconds() for ident, p in self.threads.items()}
+
+        stamp = self.started.strftime("%Y%m%d-%H%M%S")
+        out_dir = os.path.join(log_dir, f"profile-{stamp}" + (f"-{self.label}" if self.label else ""))
+        os.makedirs(out_dir, exist_ok=True)
+        elapsed = (datetime.datetime.now() - self.started).total_seconds()
+
+        ranked = sorted(self.threads.items(), key=lambda kv: kv[1].samples - kv[1].idle, reverse=True)
+        with open(os.path.join(out_dir, "summary.txt"), "w", encoding="utf-8") as f:
+            f.write(f"# Halo profile {stamp}, {elapsed:.1f} s, "
+                    f"sampled every {self.interval * 1000:.0f} ms\n")
+            f.write("# busy = not parked in a lock/queue/pipe wait (time in C calls such as\n"
+                    "# sleep or socket reads still counts); CPU s is the real cost where shown\n\n")
+            f.write(f"{'thread':<28}{'samples':>9}{'busy':>9}{'busy %':>8}{'CPU s':>9}\n")
+            for ident, p in ranked:
+                busy = p.samples - p.idle
+                cpu_s = f"{cpu[ident]:.2f}" if cpu[ident] is not None else "-"
+                f.write(f"{p.name:<28}{p.samples:>9}{busy:>9}"
+                        f"{100 * busy / max(p.samples, 1):>8.1f}{cpu_s:>9}\n")
+
+        for ident, p in ranked:
+            filename = "".join(c if c.isalnum() or c in "-_." else "_" for c in p.name)
+            with open(os.path.join(out_dir, f"{filename}.txt"), "w", encoding="utf-8") as f:
+                busy = max(p.samples - p.idle, 1)
+                f.write(f"# {p.name}: {p.samples} samples, {p.idle} idle\n")
+                for title, table in (("own", p.own), ("cumulative", p.cumulative)):
+                    f.write(f"\n{'% busy':>7}{'samples':>9}  function ({title})\n")
+                    for func, n in sorted(table.items(), key=lambda kv: kv[1], reverse=True)[:TOP_FUNCTIONS]:
+                        f.write(f"{100 * n / busy:>7.1f}{n:>9}  {func}\n")
+            with open(os.path.join(out_dir, f"{filename}.folded"), "w", encoding="utf-8") as f:
+                for stack, n in sorted(p.stacks.items()):
+                    f.write(f"{stack} {n}\n")
+        return out_dir
+
+
+def _log_dir():
+    from halo.utils.config_loader import config
+    logging_cfg = getattr(config, "logging", None)
+    return logging_cfg.get("log_dir", os.path.join("data", "logs")) if logging_cfg else os.path.join("data", "logs")
+
+
+def is_profiling() -> bool:
+    return _profiler is not None
+
+
+def start_profiling(interval_ms=DEFAULT_INTERVAL_MS, label=None):
+    """Start sampling all threads. No-op if already running."""
+    global _profiler
+    if _profiler is not None:
+        return
+    _profiler = SamplingProfiler(interval_ms, label)
+    _profiler.start()
+    print(f"[Profiling] Started (every {interval_ms} ms)")
+
+
+def stop_profiling():
+    """Stop sampling and write per-thread reports. Returns the report directory (or None)."""
+    global _profiler
+    if _profiler is None:
+        return None
+    profiler, _profiler = _profiler, None
+    out_dir = profiler.stop(_log_dir())
+    print(f"[Profiling] Reports written to {out_dir}")
+    return out_dir
+
+
+def start_from_env(label=None):
+    """Honour HALO_PROFILE=1 (or a sampling interval in ms) for the whole run."""
+    value = os.environ.get("HALO_PROFILE", "")
+    if not value or value == "0":
+        return
+    start_profiling(int(value) if value.isdigit() and value != "1" else DEFAULT_INTERVAL_MS, label)
+    atexit.register(stop_profiling)
@@ -1,9 +1,54 @@
-from PyQt6.QtWidgets import QApplication
-from halo.ui.overlay import FloatingOverlay
+import argparse
 import sys
 
-if __name__ == "__main__":
+
+def run_overlay():
+    from PyQt6.QtWidgets import QApplication
+    from halo.ui.overlay import FloatingOverlay
+
     app = QApplication(sys.argv)
     overlay = FloatingOverlay()
     overlay.show()
     sys.exit(app.exec())
+
+
+def run_headless(args):
+    # No Qt import on this path, so it runs on boxes without a display
+    from halo.ui.socket_server import serve_transcripts
+    from halo.utils.config_loader import config
+
+    if args.profile:
+        from halo.core.listener import set_profile
+        set_profile(args.profile)
+
+    server_cfg = getattr(config, "server", None)
+    serve_transcripts(
+        host=args.host or getattr(server_cfg, "host", "127.0.0.1"),
+        port=args.port or getattr(server_cfg, "port", 8765),
+        unix_path=args.unix or getattr(server_cfg, "unix_socket", None),
+    )
+
+
+if __name__ == "__main__":
+    from halo.utils.config_loader import config_service
+
+    parser = argparse.ArgumentParser(description="Halo assistant")
+    parser.add_argument("--headless", action="store_true",
+                        help="run without the overlay and stream transcripts over a socket")
+    parser.add_argument("--host", help="TCP host for headless mode")
+    parser.add_argument("--port", type=int, help="TCP port for headless mode")
+    parser.add_argument("--unix", help="Unix socket path for headless mode (instead of TCP)")
+    parser.add_argument("--profile", help="audio profile for headless mode (low-latency, balanced, low-power)")
+    args = parser.parse_args()
+
+    # Pick up edits to configs/settings.yaml while running
+    config_service.start_watching()
+
+    # HALO_PROFILE=1 samples every thread for the whole run (reports in data/logs)
+    from halo.utils import profiling
+    profiling.start_from_env()
+
+    if args.headless:
+        run_headless(args)
+    else:
+        run_overlay()
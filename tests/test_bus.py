@@ -0,0 +1,52 @@
+# tests/test_bus.py
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from halo.core.bus import EventBus  # noqa: E402
+
+
+def test_end_is_delivered_to_a_full_subscription():
+    bus = EventBus()
+    sub = bus.subscription("ui", ["partial", "transcript"], maxsize=4)
+    for i in range(10):
+        bus.publish("partial", {"text": f"p{i}"})
+    bus.publish("transcript", {"text": "hello"})
+    bus.publish("end", {})
+
+    received = []
+    consumer = threading.Thread(target=lambda: received.extend(sub))
+    consumer.start()
+    consumer.join(timeout=3)
+    assert not consumer.is_alive()
+    assert [e["text"] for e in received] == ["p0", "p1", "p2", "p3", "hello"]
+    stats = sub.stats()
+    assert stats["dropped"] == 6  # only partials
+    assert stats["over_capacity"] == 2
+
+
+def test_slow_stage_keeps_every_final():
+    bus = EventBus()
+    seen = []
+    gate = threading.Event()
+
+    def handler(topic, event):
+        gate.wait()
+        seen.append((topic, event["n"]))
+
+    stage = bus.subscribe("persist", handler, ["final", "stopped"], maxsize=2)
+    try:
+        for n in range(50):
+            bus.publish("final", {"n": n})
+        bus.publish("stopped", {"n": -1})
+        gate.set()
+        deadline = time.monotonic() + 3
+        while len(seen) < 51 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert seen == [("final", n) for n in range(50)] + [("stopped", -1)]
+        assert stage.stats()["dropped"] == 0
+    finally:
+        bus.unsubscribe(stage)
@@ -0,0 +1,75 @@
+# tests/test_messages.py
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from halo.ui.messages import MessageStore  # noqa: E402
+
+REPLY = (
+    "Here you go:\n```python\nprint('a')\n```\n"
+    "and a shell one ``` `not a fence` ```\n"
+    "```\nls -la\n```\n"
+    "then ``````\n"                      # empty block, fences back to back
+    "```js\nconst x = '``';\n```done"
+)
+EXPECTED = [
+    ("python", "print('a')"),
+    ("", "`not a fence`"),
+    ("", "ls -la"),
+    ("", ""),
+    ("js", "const x = '``';"),
+]
+
+
+def _stream(store, message, text, rng):
+    pos = 0
+    while pos < len(text):
+        size = rng.randint(1, 5)
+        store.append_to(message, text[pos:pos + size])
+        pos += size
+
+
+def test_code_blocks_found_for_any_chunking(tmp_path):
+    rng = random.Random(1234)
+    for _ in range(200):
+        store = MessageStore(spill_dir=str(tmp_path))
+        message = store.add("Halo")
+        _stream(store, message, REPLY, rng)
+
+        assert message.text == REPLY
+        assert [(b.lang, b.code) for b in message.code_blocks] == EXPECTED
+        assert store.code_block_count() == len(EXPECTED)
+        assert store.last_code_block().code == EXPECTED[-1][1]
+
+
+def test_reset_message_drops_its_blocks(tmp_path):
+    store = MessageStore(spill_dir=str(tmp_path))
+    keep = store.add("Halo", "```\nkept\n```")
+    reply = store.add("Halo", "```\nold\n```")
+    store.reset_message(reply, "[Stopped]")
+
+    assert reply.text == "[Stopped]"
+    assert [b.code for b in (store.code_block(i) for i in range(store.code_block_count()))] == ["kept"]
+    assert store.last_code_block().message is keep
+
+
+def test_old_messages_spill_to_jsonl(tmp_path):
+    store = MessageStore(max_in_memory=3, spill_dir=str(tmp_path))
+    for i in range(5):
+        store.add("User", f"question {i}")
+        store.add("Halo", f"```\ncode {i}\n```")
+
+    assert len(store) == 3
+    assert store.spilled == 7
+    assert [m.text for m in store][0] == "```\ncode 3\n```"
+    # Blocks of spilled messages are gone from the index
+    assert [store.code_block(i).code for i in range(store.code_block_count())] == ["code 3", "code 4"]
+
+    with open(store.spill_path, encoding="utf-8") as f:
+        spilled = [json.loads(line) for line in f]
+    assert [m["text"] for m in spilled[:2]] == ["question 0", "```\ncode 0\n```"]
+    assert spilled[1]["code_blocks"] == [{"lang": "", "code": "code 0"}]
+    assert len(spilled) == 7
@@ -0,0 +1,68 @@
+# tests/test_pcm_ring.py
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from halo.core.pcm_ring import PcmRing  # noqa: E402
+
+WRITERS = 3
+RECORDS = 2000
+
+
+def _write_all(ring, index, results):
+    written = 0
+    for i in range(RECORDS):
+        payload = bytes([index]) * 64 + i.to_bytes(4, "little")
+        if ring.write(index, i, payload):
+            written += 1
+    results[index] = written
+
+
+def test_concurrent_writers_lose_nothing():
+    ring = PcmRing.create(4 * 1024 * 1024)
+    reader = PcmRing.attach(ring.name)
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads often so unsynchronized writers would collide
+    try:
+        results = {}
+        threads = [threading.Thread(target=_write_all, args=(ring, i, results)) for i in range(WRITERS)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        seen = {i: [] for i in range(WRITERS)}
+        for index, start, pcm in reader.read():
+            assert pcm[:64] == bytes([index]) * 64
+            assert int.from_bytes(pcm[64:], "little") == start
+            seen[index].append(start)
+
+        stats = ring.stats()
+        assert stats["used"] == 0
+        for i in range(WRITERS):
+            # Every record is either read back (in order) or counted as dropped
+            assert seen[i] == sorted(seen[i])
+            assert len(seen[i]) == results[i]
+        assert sum(results.values()) + stats["dropped"] == WRITERS * RECORDS
+        assert stats["dropped"] == 0  # 4 MiB holds all of it
+    finally:
+        sys.setswitchinterval(interval)
+        reader.close()
+        ring.close()
+
+
+def test_full_ring_counts_drops_and_wraps():
+    ring = PcmRing.create(1024)
+    try:
+        accepted = sum(ring.write(0, i, bytes(100)) for i in range(20))
+        assert accepted + ring.stats()["dropped"] == 20
+        assert len(list(ring.read())) == accepted
+        # After draining, writes wrap around the end of the buffer intact
+        for i in range(20):
+            assert ring.write(1, i, i.to_bytes(2, "little") * 50)
+            [(index, start, pcm)] = list(ring.read())
+            assert (index, start, pcm) == (1, i, i.to_bytes(2, "little") * 50)
+    finally:
+        ring.close()